@@ -2,20 +2,9 @@
 Main application page - Resume Analysis
 """
 import streamlit as st
-from openai import OpenAI
-from PyPDF2 import PdfReader
-from docx import Document
-import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from datetime import datetime
-import re
 
-# Import your existing functions (we'll move them to a utils file)
-# from utils import analyze_resume_with_ai, generate_pdf_report, etc.
+# Analysis and export functions live in resume_engine
+# from resume_engine import analyze_resume_with_ai, generate_pdf_report, etc.
 
 st.set_page_config(
     page_title="AI Resume Analyzer",
@@ -0,0 +1,131 @@
+"""
+Structured resume analysis results and parsers for LLM output
+"""
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+SCORE_MIN = 1
+SCORE_MAX = 100
+
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_SCORE_RE = re.compile(r'score[^0-9\n]{0,40}(\d{1,3})(?:\s*/\s*(\d{1,3}))?', re.IGNORECASE)
+_BARE_NUMBER_RE = re.compile(r'^\D*(\d{1,3})\D*$')
+_BULLET_RE = re.compile(r'^\s*(?:[-*•+]|\d+[.)])\s+')
+
+# Header keywords used to sort markdown sections into fields when JSON parsing fails
+_SECTION_KEYWORDS = (
+    ('strengths', ('strength', 'outstanding', 'highlight')),
+    ('gaps', ('gap', 'weakness', 'missing', 'concern')),
+    ('recommendations', ('recommend', 'suggest', 'improvement')),
+    ('career_path', ('career', 'path', 'future')),
+)
+
+@dataclass
+class ResumeAnalysis:
+    """Typed result of a structured resume evaluation"""
+    score: Optional[int] = None
+    strengths: list = field(default_factory=list)
+    gaps: list = field(default_factory=list)
+    recommendations: list = field(default_factory=list)
+    career_path: str = ""
+    parsed_from: str = "json"
+
+    def to_dict(self):
+        return asdict(self)
+
+    def to_markdown(self):
+        """Render the analysis the way the free-form report is shown in the UI"""
+        parts = [f"**Overall Score:** {self.score if self.score is not None else 'N/A'}/100"]
+        for title, items in (("Strengths", self.strengths), ("Gaps", self.gaps),
+                             ("Recommendations", self.recommendations)):
+            if items:
+                parts.append(f"### {title}\n" + '\n'.join(f"- {item}" for item in items))
+        if self.career_path:
+            parts.append(f"### Career Path\n{self.career_path}")
+        return '\n\n'.join(parts)
+
+def validate_score(value):
+    """Return value as an int in the 1-100 range, or None if it is not a usable score"""
+    try:
+        score = int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+    return score if SCORE_MIN <= score <= SCORE_MAX else None
+
+def _string_list(value):
+    if isinstance(value, str):
+        value = value.split('\n')
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [_BULLET_RE.sub('', str(item)).strip() for item in value if str(item).strip()]
+
+def parse_score(text):
+    """Extract a 1-100 score from a JSON reply, a bare number or free-form text"""
+    if not text:
+        return None
+    match = _JSON_OBJECT_RE.search(text)
+    if match:
+        try:
+            data = json.loads(match.group(0), strict=False)
+            if isinstance(data, dict) and 'score' in data:
+                return validate_score(data['score'])
+        except ValueError:
+            pass
+
+    match = _BARE_NUMBER_RE.match(text.strip())
+    if match:
+        return validate_score(match.group(1))
+
+    match = _SCORE_RE.search(text)
+    if match:
+        score, scale = match.group(1), match.group(2)
+        if scale and scale == '10':
+            # Some replies still use a 1-10 scale
+            return validate_score(int(score) * 10)
+        return validate_score(score)
+    return None
+
+def parse_markdown_analysis(text):
+    """Fallback parser that pulls fields out of a free-form markdown analysis"""
+    analysis = ResumeAnalysis(score=parse_score(text), parsed_from="markdown")
+    current = None
+    career_lines = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        is_bullet = bool(_BULLET_RE.match(stripped))
+        lowered = stripped.lower()
+        if not is_bullet and (stripped.startswith('#') or stripped.endswith(':') or stripped.startswith('**')):
+            current = next((name for name, keywords in _SECTION_KEYWORDS
+                            if any(keyword in lowered for keyword in keywords)), None)
+            continue
+        if current == 'career_path':
+            career_lines.append(_BULLET_RE.sub('', stripped))
+        elif current and is_bullet:
+            getattr(analysis, current).append(_BULLET_RE.sub('', stripped))
+    analysis.career_path = ' '.join(career_lines)
+    return analysis
+
+def parse_structured_analysis(text):
+    """Parse a JSON analysis reply into a ResumeAnalysis, falling back to the markdown parser"""
+    match = _JSON_OBJECT_RE.search(text or "")
+    if match:
+        try:
+            data = json.loads(match.group(0), strict=False)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            career_path = data.get('career_path', "")
+            if isinstance(career_path, (list, tuple)):
+                career_path = ' '.join(str(item) for item in career_path)
+            return ResumeAnalysis(
+                score=validate_score(data.get('score')),
+                strengths=_string_list(data.get('strengths', [])),
+                gaps=_string_list(data.get('gaps', [])),
+                recommendations=_string_list(data.get('recommendations', [])),
+                career_path=str(career_path or "").strip(),
+            )
+    return parse_markdown_analysis(text or "")
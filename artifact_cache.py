@@ -0,0 +1,114 @@
+"""
+Bounded in-memory cache of rendered download artifacts (PDF reports, DOCX/TXT resumes)
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("RESUME_ANALYZER_ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+def artifact_key(content, fmt, template_version, *params):
+    """SHA-256 over the source content, output format, template version and any render parameters"""
+    digest = hashlib.sha256()
+    for part in (fmt, template_version, *params, content):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+class ArtifactCache:
+    """LRU cache of rendered bytes bounded by total size; concurrent requests for one key render only once"""
+
+    def __init__(self, max_bytes=ARTIFACT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._artifacts = OrderedDict()
+        self._size = 0
+        self._rendering = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._artifacts.get(key)
+            if data is not None:
+                self._artifacts.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def set(self, key, data):
+        with self._lock:
+            self._store(key, data)
+
+    def _store(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        if key in self._artifacts:
+            self._size -= len(self._artifacts.pop(key))
+        self._artifacts[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._artifacts.popitem(last=False)
+            self._size -= len(evicted)
+
+    def evict(self, key):
+        with self._lock:
+            data = self._artifacts.pop(key, None)
+            if data is not None:
+                self._size -= len(data)
+
+    def clear(self):
+        with self._lock:
+            self._artifacts.clear()
+            self._size = 0
+
+    def get_or_render(self, key, render):
+        """Return the cached bytes for key, or call render() (bytes or a file-like object) once and cache them"""
+        with self._lock:
+            data = self._artifacts.get(key)
+            if data is not None:
+                self._artifacts.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+            event = self._rendering.get(key)
+            owner = event is None
+            if owner:
+                event = self._rendering[key] = threading.Event()
+
+        if not owner:
+            # Someone else is rendering this artifact; wait for theirs instead of rendering it twice
+            event.wait()
+            data = self.get(key)
+            if data is not None:
+                return data
+            return self._read(render())
+
+        try:
+            data = self._read(render())
+            with self._lock:
+                self._store(key, data)
+            return data
+        finally:
+            with self._lock:
+                del self._rendering[key]
+            event.set()
+
+    @staticmethod
+    def _read(result):
+        return result.getvalue() if hasattr(result, 'getvalue') else bytes(result)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._artifacts), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+_artifact_cache = None
+_artifact_cache_lock = threading.Lock()
+
+def get_artifact_cache():
+    """Return the process-wide artifact cache"""
+    global _artifact_cache
+    with _artifact_cache_lock:
+        if _artifact_cache is None:
+            _artifact_cache = ArtifactCache()
+        return _artifact_cache
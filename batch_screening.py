@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Headless bulk resume screening for the AI Resume Analyzer
+
+Usage:
+    python batch_screening.py resumes/ --position "BackEnd Developer" --output results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from llm_cache import get_response_cache, make_cache_key
+from llm_clients import create_async_openai_client
+from analysis_schema import parse_score, parse_structured_analysis
+from prompt_compaction import compact_prompt_input
+from resume_engine import (
+    ANALYSIS_MAX_TOKENS, API_BASE_URL, MIME_TYPES, MODEL_NAME, PROMPT_VERSION, RESUME_TOKEN_BUDGET,
+    SCORE_ONLY_MAX_TOKENS, STRUCTURED_ANALYSIS_MAX_TOKENS, TARGET_POSITION,
+    build_analysis_messages, build_score_messages, build_structured_analysis_messages, read_path_text
+)
+
+# mode -> (cache kind, message builder, max_tokens)
+SCREENING_MODES = {
+    'full': ("analysis", build_analysis_messages, ANALYSIS_MAX_TOKENS),
+    'structured': ("analysis_structured", build_structured_analysis_messages, STRUCTURED_ANALYSIS_MAX_TOKENS),
+    'score': ("score", build_score_messages, SCORE_ONLY_MAX_TOKENS),
+}
+
+def extract_path(path):
+    """Extract and compact resume text from a file on disk (runs in a worker process)"""
+    return compact_prompt_input(read_path_text(path), RESUME_TOKEN_BUDGET)
+
+def find_resume_files(directory):
+    """Return the supported resume files in directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.splitext(name)[1].lower() in MIME_TYPES
+    )
+
+class AsyncRateLimiter:
+    """Space out request starts so no more than rate requests begin per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+async def screen_directory(directory, position, api_key, output_path, base_url=API_BASE_URL,
+                           concurrency=8, rate=None, extract_workers=None, mode='full'):
+    """Screen every resume in directory against position, appending one JSON record per file to output_path"""
+    kind, build_messages, max_tokens = SCREENING_MODES[mode]
+    paths = find_resume_files(directory)
+    loop = asyncio.get_running_loop()
+    client = create_async_openai_client(api_key, base_url, max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = AsyncRateLimiter(rate)
+    cache = get_response_cache()
+    # Answers from another endpoint (e.g. a local stand-in) must not land under the keys the app reads
+    endpoint = () if base_url == API_BASE_URL else (base_url,)
+    summary = {'total': len(paths), 'ok': 0, 'error': 0, 'cached': 0}
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as pool, \
+            open(output_path, 'w', encoding='utf-8') as output:
+
+        async def screen(path):
+            started = time.perf_counter()
+            record = {'file': path, 'position': position}
+            try:
+                text = await loop.run_in_executor(pool, extract_path, path)
+                record['extract_seconds'] = round(time.perf_counter() - started, 4)
+
+                key = make_cache_key(kind, MODEL_NAME, PROMPT_VERSION, text, position, *endpoint)
+                analysis = cache.get(key)
+                record['cached'] = analysis is not None
+                if analysis is None:
+                    async with semaphore:
+                        await limiter.acquire()
+                        analysis_started = time.perf_counter()
+                        response = await client.chat.completions.create(
+                            model=MODEL_NAME,
+                            messages=build_messages(text, position),
+                            max_tokens=max_tokens
+                        )
+                        record['analysis_seconds'] = round(time.perf_counter() - analysis_started, 4)
+                    analysis = response.choices[0].message.content
+                    cache.set(key, analysis)
+
+                record['status'] = 'ok'
+                if mode == 'score':
+                    record['score'] = parse_score(analysis)
+                elif mode == 'structured':
+                    record.update(parse_structured_analysis(analysis).to_dict())
+                else:
+                    record['analysis'] = analysis
+                summary['ok'] += 1
+                summary['cached'] += record['cached']
+            except Exception as e:
+                record['status'] = 'error'
+                record['error'] = str(e)
+                summary['error'] += 1
+
+            record['total_seconds'] = round(time.perf_counter() - started, 4)
+            # Write each record as soon as it finishes so partial runs still leave usable output
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+
+        try:
+            await asyncio.gather(*(screen(path) for path in paths))
+        finally:
+            await client.close()
+
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of TXT/PDF/DOCX/RTF/ODT/HTML resumes against one target position")
+    parser.add_argument("directory", help="Directory containing resume files")
+    parser.add_argument("--position", required=True, choices=TARGET_POSITION, help="Target position to screen against")
+    parser.add_argument("--output", default="screening_results.jsonl", help="JSONL file to write results to")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"), help="API key (defaults to $OPENAI_API_KEY)")
+    parser.add_argument("--base-url", default=os.getenv("OPENAI_BASE_URL", API_BASE_URL), help="OpenAI-compatible API base URL")
+    parser.add_argument("--mode", choices=sorted(SCREENING_MODES), default='full',
+                        help="full: markdown analysis; structured: JSON fields; score: score only (fastest)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent LLM requests")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum LLM requests started per second")
+    parser.add_argument("--extract-workers", type=int, default=None, help="Processes used for text extraction")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("an API key is required (--api-key or $OPENAI_API_KEY)")
+
+    started = time.perf_counter()
+    summary = asyncio.run(screen_directory(
+        args.directory, args.position, args.api_key, args.output,
+        base_url=args.base_url, concurrency=args.concurrency,
+        rate=args.rate, extract_workers=args.extract_workers, mode=args.mode
+    ))
+    elapsed = time.perf_counter() - started
+    print(f"Screened {summary['total']} resumes in {elapsed:.1f}s "
+          f"({summary['ok']} ok, {summary['error']} errors, {summary['cached']} from cache) -> {args.output}")
+    return 0 if summary['error'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for document extraction and report/resume artifact generation
+
+Builds a deterministic synthetic corpus (TXT/PDF/DOCX resumes and markdown analyses of 1-500 pages),
+times the hot paths, and compares the results with a stored baseline.
+
+Usage:
+    python benchmarks.py                                  # run and compare with benchmark_baseline.json
+    python benchmarks.py --pages 1,10 --functions generate_resume_txt
+    python benchmarks.py --save-baseline                  # record a new baseline on this machine
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Measure the extractors themselves rather than the extraction cache
+os.environ.setdefault("RESUME_ANALYZER_EXTRACTION_CACHE", "0")
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+import resume_engine
+from text_normalization import RULE_SETS, normalize_text
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_PAGES = (1, 10, 100, 500)
+CHARS_PER_PAGE = 3000
+LINES_PER_PAGE = 50
+# Differences below these are noise, whatever the ratio
+MIN_REGRESSION_MS = 2.0
+MIN_REGRESSION_MB = 0.5
+
+MIME_TYPES = {
+    'txt': "text/plain",
+    'pdf': "application/pdf",
+    'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+_WORDS = (
+    "designed built led migrated optimized deployed scaled automated refactored mentored "
+    "Python Django Flask FastAPI React TypeScript Vue Node.js PostgreSQL Redis Kafka Docker Kubernetes "
+    "AWS GCP Terraform Spark Airflow pandas SQL GraphQL REST microservices pipelines dashboards "
+    "latency throughput reliability customers revenue platform services team features releases"
+).split()
+_SECTIONS = ("PROFESSIONAL SUMMARY", "WORK EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION", "CERTIFICATIONS")
+_EMOJI = ("✅", "❌", "🔍", "💡", "🌟", "🚀", "•")
+
+def _sentence(rng, words=(8, 20)):
+    sentence = ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(*words)))
+    return sentence[0].upper() + sentence[1:] + '.'
+
+def synthetic_resume(pages, seed=0):
+    """Deterministic plain-text resume of roughly pages * CHARS_PER_PAGE characters"""
+    rng = random.Random(f"resume:{pages}:{seed}")
+    lines = ["JANE DOE", "jane.doe@example.com | +1 555 0100 | github.com/janedoe", ""]
+    target = pages * CHARS_PER_PAGE
+    size = sum(len(line) + 1 for line in lines)
+    while size < target:
+        section = rng.choice(_SECTIONS)
+        block = [section]
+        if section in ("WORK EXPERIENCE", "PROJECTS"):
+            block.append(f"Senior Engineer, Company {rng.randint(1, 999)} ({rng.randint(2005, 2024)} - Present)")
+            block.extend(f"- {_sentence(rng)}" for _ in range(rng.randint(3, 6)))
+            block.append(f"• {_sentence(rng)}")
+        elif section == "SKILLS":
+            block.append(', '.join(rng.sample(_WORDS, 12)))
+        else:
+            block.append(' '.join(_sentence(rng) for _ in range(rng.randint(2, 4))))
+        if rng.random() < 0.2:
+            # Commentary the artifact generators are expected to strip
+            block.append(f"Note: {_sentence(rng)}")
+        block.append("")
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+    return '\n'.join(lines)
+
+def synthetic_analysis(pages, seed=0):
+    """Deterministic markdown analysis (headings, tables, emoji, long paragraphs) of roughly pages * CHARS_PER_PAGE characters"""
+    rng = random.Random(f"analysis:{pages}:{seed}")
+    parts = [f"## Overall Assessment Score: {rng.randint(40, 95)}/100\n"]
+    target = pages * CHARS_PER_PAGE
+    size = len(parts[0])
+    while size < target:
+        kind = rng.random()
+        if kind < 0.15:
+            rows = '\n'.join(f"| {rng.choice(_WORDS)} | {rng.randint(1, 10)}/10 | {_sentence(rng, (3, 6))} |" for _ in range(4))
+            part = f"| Skill | Rating | Comment |\n|-------|--------|---------|\n{rows}\n"
+        elif kind < 0.4:
+            part = '\n'.join(f"{rng.choice(_EMOJI)} **{rng.choice(_WORDS)}**: {_sentence(rng)}" for _ in range(4)) + '\n'
+        elif kind < 0.5:
+            part = f"### {rng.choice(_SECTIONS).title()} <b>review</b>\n"
+        else:
+            # Occasionally longer than the PDF report's 800 character paragraph split
+            part = ' '.join(_sentence(rng) for _ in range(rng.randint(3, 40))) + ' Résumé naïve 简历.\n'
+        parts.append(part + '\n')
+        size += len(part) + 1
+    return ''.join(parts)
+
+def build_document(fmt, text, pages):
+    """Render text as a TXT, PDF (exactly pages pages) or DOCX file and return its bytes"""
+    if fmt == 'txt':
+        return text.encode('utf-8')
+    lines = text.split('\n')
+    if fmt == 'pdf':
+        buffer = io.BytesIO()
+        pdf = canvas.Canvas(buffer, pagesize=A4)
+        per_page = math.ceil(len(lines) / pages)
+        for start in range(0, per_page * pages, per_page):
+            y = 800
+            for line in lines[start:start + per_page]:
+                pdf.drawString(40, y, line[:110])
+                y -= 780 / max(per_page, LINES_PER_PAGE)
+            pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+    if fmt == 'docx':
+        from docx import Document
+        doc = Document()
+        for line in lines:
+            doc.add_paragraph(line)
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    raise ValueError(f"Unknown corpus format: {fmt}")
+
+class BenchmarkUpload(io.BytesIO):
+    """In-memory file with the UploadedFile attributes extract_file_content relies on"""
+
+    def __init__(self, data, fmt):
+        super().__init__(data)
+        self.name = f"resume.{fmt}"
+        self.type = MIME_TYPES[fmt]
+        self.size = len(data)
+
+def _extract_cases(pages):
+    resume = synthetic_resume(pages)
+    for fmt in ('txt', 'pdf', 'docx'):
+        data = build_document(fmt, resume, pages)
+        yield fmt, len(data), lambda data=data, fmt=fmt: resume_engine.extract_file_content(BenchmarkUpload(data, fmt))
+
+def _analysis_cases(func):
+    def cases(pages):
+        analysis = synthetic_analysis(pages)
+        yield None, len(analysis.encode('utf-8')), lambda: func(analysis)
+    return cases
+
+def _report_cases(pages):
+    analysis = synthetic_analysis(pages)
+    # One paragraph with no sentence ends, e.g. a pasted skills dump or several reports run together
+    run_on = analysis.replace('. ', ', ').replace('\n\n', '\n')
+    for variant, text in ((None, analysis), ('run-on', run_on)):
+        yield variant, len(text.encode('utf-8')), lambda text=text: resume_engine.generate_pdf_report(text, "BackEnd Developer")
+
+def _resume_cases(func):
+    def cases(pages):
+        resume = synthetic_resume(pages)
+        yield None, len(resume.encode('utf-8')), lambda: func(resume)
+    return cases
+
+def _normalize_cases(pages):
+    analysis = synthetic_analysis(pages)
+    for name, rules in RULE_SETS.items():
+        yield name, len(analysis.encode('utf-8')), lambda rules=rules: normalize_text(analysis, rules)
+
+# name -> cases(pages) yielding (variant, input_bytes, zero-argument callable)
+BENCHMARKS = {
+    'extract_file_content': _extract_cases,
+    'clean_text_for_pdf': _analysis_cases(resume_engine.clean_text_for_pdf),
+    'normalize_text': _normalize_cases,
+    'generate_pdf_report': _report_cases,
+    'generate_resume_docx': _resume_cases(resume_engine.generate_resume_docx),
+    'generate_resume_txt': _resume_cases(resume_engine.generate_resume_txt),
+    'classify_lines': _resume_cases(lambda text: list(resume_engine.DOCX_LINE_CLASSIFIER.classify_lines(text))),
+}
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def measure(func, input_bytes, repeat=5, max_seconds=10.0):
+    """Time func over up to repeat runs (fewer once max_seconds is spent) and measure its peak Python heap"""
+    started = time.perf_counter()
+    func()
+    first = time.perf_counter() - started
+    # A first run that already blows the budget is kept as the only sample instead of being a warm-up
+    samples = [first] if first >= max_seconds else []
+    spent = first
+    while len(samples) < repeat and not (samples and spent >= max_seconds):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        spent += elapsed
+
+    # tracemalloc slows allocation-heavy code down, so memory gets its own run
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50 = percentile(samples, 50)
+    return {
+        'input_bytes': input_bytes,
+        'samples': len(samples),
+        'p50_ms': round(p50 * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'throughput_mb_s': round(input_bytes / 1e6 / p50, 3) if p50 else None,
+        'peak_mb': round(peak / 1e6, 3),
+    }
+
+def run_benchmarks(functions=None, pages_list=DEFAULT_PAGES, repeat=5, max_seconds=10.0, progress=None):
+    """Run the selected benchmarks and return {case name: metrics}"""
+    results = {}
+    for name in functions or BENCHMARKS:
+        for pages in pages_list:
+            for variant, input_bytes, func in BENCHMARKS[name](pages):
+                case = f"{name}[{variant}]@{pages}p" if variant else f"{name}@{pages}p"
+                results[case] = dict(pages=pages, **measure(func, input_bytes, repeat, max_seconds))
+                if progress:
+                    progress(case, results[case])
+    return results
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def compare(results, baseline, tolerance=0.25):
+    """Return {case: [regression messages]} for cases slower or hungrier than baseline by more than tolerance"""
+    regressions = {}
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        problems = []
+        if (current['p50_ms'] > previous['p50_ms'] * (1 + tolerance)
+                and current['p50_ms'] - previous['p50_ms'] >= MIN_REGRESSION_MS):
+            problems.append(f"p50 {previous['p50_ms']:.1f} -> {current['p50_ms']:.1f} ms")
+        if (current['peak_mb'] > previous['peak_mb'] * (1 + tolerance)
+                and current['peak_mb'] - previous['peak_mb'] >= MIN_REGRESSION_MB):
+            problems.append(f"peak {previous['peak_mb']:.1f} -> {current['peak_mb']:.1f} MB")
+        if problems:
+            regressions[case] = problems
+    return regressions
+
+def _format_row(case, metrics, previous=None):
+    delta = ""
+    if previous and previous.get('p50_ms'):
+        delta = f"{(metrics['p50_ms'] / previous['p50_ms'] - 1) * 100:+.0f}%"
+    throughput = metrics['throughput_mb_s']
+    return (f"{case:<44} {metrics['p50_ms']:>11.2f} {metrics['p99_ms']:>11.2f} "
+            f"{throughput if throughput is not None else float('nan'):>9.2f} {metrics['peak_mb']:>9.1f} {delta:>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction and artifact generation on a synthetic corpus")
+    parser.add_argument("--functions", default=",".join(BENCHMARKS),
+                        help=f"Comma-separated functions to benchmark (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--pages", default=",".join(map(str, DEFAULT_PAGES)), help="Comma-separated corpus sizes in pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (after one warm-up run)")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Stop repeating a case once this much time is spent on it")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown / memory growth before a case is a regression")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    functions = [name.strip() for name in args.functions.split(',') if name.strip()]
+    unknown = [name for name in functions if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown functions: {', '.join(unknown)}")
+    pages_list = [int(pages) for pages in args.pages.split(',')]
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            stored = json.load(f)
+        baseline = stored.get('results', {})
+        if stored.get('environment') != environment_info():
+            print(f"Note: baseline was recorded on {stored.get('environment')}, comparisons are approximate")
+
+    print(f"{'case':<44} {'p50 ms':>11} {'p99 ms':>11} {'MB/s':>9} {'peak MB':>9} {'vs base':>8}")
+    results = run_benchmarks(
+        functions, pages_list, args.repeat, args.max_seconds,
+        progress=lambda case, metrics: print(_format_row(case, metrics, baseline.get(case)), flush=True)
+    )
+    report = {'environment': environment_info(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # Partial runs only replace the cases they measured
+            with open(args.baseline, encoding='utf-8') as f:
+                report['results'] = dict(json.load(f).get('results', {}), **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Saved baseline for {len(results)} cases -> {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for case, problems in regressions.items():
+        print(f"REGRESSION {case}: {'; '.join(problems)}")
+    if baseline:
+        print(f"{len(regressions)} regressions in {len(results)} cases (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Low-memory DOCX text extraction by streaming the WordprocessingML parts straight out of the ZIP
+"""
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_PARAGRAPH = _W + 'p'
+_RUN = _W + 'r'
+_TEXT = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+_ROW = _W + 'tr'
+_CELL = _W + 'tc'
+
+_HEADER_RE = re.compile(r'^word/header\d*\.xml$')
+_FOOTER_RE = re.compile(r'^word/footer\d*\.xml$')
+BODY_PART = 'word/document.xml'
+
+def iter_part_lines(stream):
+    """Yield paragraph and table-row text from one WordprocessingML part in document order"""
+    paragraphs = []  # stack: text boxes put paragraphs inside paragraphs
+    rows = []
+    cells = []
+    run_depth = 0
+    fallback_depth = 0
+
+    for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            # Text boxes are stored twice (DrawingML choice + VML fallback); read only the first copy
+            fallback_depth += 1 if event == 'start' else -1
+            if event == 'end':
+                elem.clear()
+            continue
+        if fallback_depth:
+            continue
+
+        if event == 'start':
+            if tag == _PARAGRAPH:
+                paragraphs.append([])
+            elif tag == _RUN:
+                run_depth += 1
+            elif tag == _ROW:
+                rows.append([])
+            elif tag == _CELL:
+                cells.append([])
+            continue
+
+        if tag == _TEXT:
+            if paragraphs:
+                paragraphs[-1].append(elem.text or '')
+        elif tag == _RUN:
+            run_depth -= 1
+        elif tag == _TAB:
+            # w:tab also defines tab stops in paragraph properties; only tabs inside runs are text
+            if run_depth and paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == _PARAGRAPH:
+            line = ''.join(paragraphs.pop()).strip()
+            if line:
+                if cells:
+                    cells[-1].append(line)
+                else:
+                    yield line
+            elem.clear()
+        elif tag == _CELL:
+            text = ' '.join(cells.pop())
+            if rows:
+                rows[-1].append(text)
+        elif tag == _ROW:
+            row = [cell for cell in rows.pop() if cell]
+            if row:
+                line = ' | '.join(row)
+                if cells:
+                    cells[-1].append(line)
+                else:
+                    yield line
+            elem.clear()
+
+def iter_docx_lines(source):
+    """Yield text lines from headers, body and footers of a DOCX given as bytes or a file object"""
+    with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source) as archive:
+        names = archive.namelist()
+        parts = sorted(n for n in names if _HEADER_RE.match(n)) + [BODY_PART] + sorted(n for n in names if _FOOTER_RE.match(n))
+        seen_furniture = set()
+        for name in parts:
+            if name not in names:
+                continue
+            with archive.open(name) as stream:
+                for line in iter_part_lines(stream):
+                    if name != BODY_PART:
+                        # Documents often repeat the same header/footer across first/even/default pages
+                        if line in seen_furniture:
+                            continue
+                        seen_furniture.add(line)
+                    yield line
+
+def extract_docx_text(source):
+    """Extract the text of a DOCX, including tables, text boxes, headers and footers"""
+    return '\n'.join(iter_docx_lines(source)).strip()
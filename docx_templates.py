@@ -0,0 +1,186 @@
+"""
+DOCX resume templates: each template is configured and packaged once per process, then cloned per resume
+"""
+import io
+import re
+import threading
+import zipfile
+from xml.sax.saxutils import escape
+
+from line_classifier import BULLET, HEADER
+
+DEFAULT_DOCX_TEMPLATE = "classic"
+DOCUMENT_PART = "word/document.xml"
+# Paragraph XML is handed to the compressor in batches of about this many characters
+WRITE_BATCH_CHARS = 64 * 1024
+
+# name -> page and paragraph style settings; sizes in points, margins in inches (top, bottom, left, right)
+DOCX_TEMPLATES = {
+    'classic': {
+        'label': "Classic",
+        'premium': False,
+        'margins': (0.5, 0.5, 0.75, 0.75),
+        'font': None,
+        'body_size': None,
+        'heading_size': 10.8,
+        'heading_color': None,
+        'heading_rule': False,
+        'heading_space_before': 0,
+        'heading_space_after': 7.2,
+        'body_space_after': 5.76,
+        'bullet_space_after': 3.6,
+    },
+    'modern': {
+        'label': "Modern",
+        'premium': True,
+        'margins': (0.6, 0.6, 0.8, 0.8),
+        'font': "Calibri",
+        'body_size': 10.5,
+        'heading_size': 12,
+        'heading_color': "0F766E",
+        'heading_rule': True,
+        'heading_space_before': 10,
+        'heading_space_after': 4,
+        'body_space_after': 4,
+        'bullet_space_after': 2,
+    },
+    'executive': {
+        'label': "Executive",
+        'premium': True,
+        'margins': (0.75, 0.75, 1.0, 1.0),
+        'font': "Georgia",
+        'body_size': 11,
+        'heading_size': 13,
+        'heading_color': "1F2A44",
+        'heading_rule': True,
+        'heading_space_before': 14,
+        'heading_space_after': 6,
+        'body_space_after': 6,
+        'bullet_space_after': 3,
+    },
+}
+
+# XML 1.0 cannot carry these at all; python-docx refuses them, so they are dropped instead
+_INVALID_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+def docx_template_names(premium=False):
+    """Template names available to a user, free templates first"""
+    return [name for name, spec in DOCX_TEMPLATES.items() if premium or not spec['premium']]
+
+def _run_xml(text):
+    text = escape(_INVALID_XML_RE.sub('', text))
+    # Tabs are their own element in WordprocessingML, as python-docx's add_run writes them
+    return '<w:r><w:t xml:space="preserve">' + text.replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">') + '</w:t></w:r>'
+
+class DocxTemplate:
+    """A resume template packaged once: every part except the document body is pre-compressed into a ZIP prefix"""
+
+    def __init__(self, name, label, premium, margins, font, body_size, heading_size, heading_color, heading_rule,
+                 heading_space_before, heading_space_after, body_space_after, bullet_space_after):
+        from docx import Document
+        from docx.enum.style import WD_STYLE_TYPE
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        from docx.shared import Inches, Pt, RGBColor
+
+        self.name = name
+        self.label = label
+        self.premium = premium
+
+        doc = Document()
+        top, bottom, left, right = margins
+        for section in doc.sections:
+            section.top_margin = Inches(top)
+            section.bottom_margin = Inches(bottom)
+            section.left_margin = Inches(left)
+            section.right_margin = Inches(right)
+
+        styles = doc.styles
+        body = styles.add_style('Resume Body', WD_STYLE_TYPE.PARAGRAPH)
+        body.base_style = styles['Normal']
+        body.paragraph_format.space_after = Pt(body_space_after)
+        heading = styles.add_style('Resume Heading', WD_STYLE_TYPE.PARAGRAPH)
+        heading.base_style = body
+        heading.font.bold = True
+        heading.font.size = Pt(heading_size)
+        heading.paragraph_format.space_before = Pt(heading_space_before)
+        heading.paragraph_format.space_after = Pt(heading_space_after)
+        heading.paragraph_format.keep_with_next = True
+        if heading_color:
+            heading.font.color.rgb = RGBColor.from_string(heading_color)
+        if heading_rule:
+            borders = OxmlElement('w:pBdr')
+            bottom_border = OxmlElement('w:bottom')
+            for attribute, value in (('w:val', 'single'), ('w:sz', '6'), ('w:space', '1'), ('w:color', heading_color or 'auto')):
+                bottom_border.set(qn(attribute), value)
+            borders.append(bottom_border)
+            heading.element.get_or_add_pPr().append(borders)
+        bullet = styles['List Bullet']
+        bullet.paragraph_format.space_after = Pt(bullet_space_after)
+        for style in (styles['Normal'], bullet):
+            if font:
+                style.font.name = font
+            if body_size:
+                style.font.size = Pt(body_size)
+
+        self._styles = {HEADER: heading.style_id, BULLET: bullet.style_id}
+        self._body_style = body.style_id
+
+        blank = io.BytesIO()
+        doc.save(blank)
+        self._prefix, self._document_head, self._document_tail = self._package(blank)
+
+    @staticmethod
+    def _package(blank):
+        """Split a saved blank document into a ZIP of its fixed parts and the body's surrounding XML"""
+        prefix = io.BytesIO()
+        with zipfile.ZipFile(blank) as source, zipfile.ZipFile(prefix, 'w', zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                data = source.read(info)
+                if info.filename == DOCUMENT_PART:
+                    document = data.decode('utf-8')
+                else:
+                    target.writestr(info.filename, data)
+        # The blank body only holds the section properties; paragraphs go in front of them
+        split = document.index('<w:sectPr')
+        return prefix.getvalue(), document[:split], document[split:]
+
+    def iter_paragraphs_xml(self, lines):
+        """Yield a WordprocessingML paragraph for each (kind, line) pair from the line classifier"""
+        for kind, line in lines:
+            if kind == BULLET:
+                line = line[1:].strip()
+            style = self._styles.get(kind, self._body_style)
+            yield f'<w:p><w:pPr><w:pStyle w:val="{style}"/></w:pPr>{_run_xml(line)}</w:p>'
+
+    def render(self, lines):
+        """Return a BytesIO DOCX with one paragraph per (kind, line) pair, positioned at the start"""
+        # Appending to a copy of the pre-built package compresses only the document part, streamed in batches
+        buffer = io.BytesIO(self._prefix)
+        with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as package, package.open(DOCUMENT_PART, 'w') as part:
+            batch = [self._document_head]
+            size = 0
+            for paragraph in self.iter_paragraphs_xml(lines):
+                batch.append(paragraph)
+                size += len(paragraph)
+                if size >= WRITE_BATCH_CHARS:
+                    part.write(''.join(batch).encode('utf-8'))
+                    batch.clear()
+                    size = 0
+            batch.append(self._document_tail)
+            part.write(''.join(batch).encode('utf-8'))
+        buffer.seek(0)
+        return buffer
+
+_docx_templates = {}
+_docx_templates_lock = threading.Lock()
+
+def get_docx_template(name=DEFAULT_DOCX_TEMPLATE):
+    """Return the named DOCX template, building it on first use"""
+    with _docx_templates_lock:
+        template = _docx_templates.get(name)
+        if template is None:
+            if name not in DOCX_TEMPLATES:
+                raise KeyError(f"Unknown DOCX template: {name}")
+            template = _docx_templates[name] = DocxTemplate(name, **DOCX_TEMPLATES[name])
+        return template
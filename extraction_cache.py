@@ -0,0 +1,110 @@
+"""
+Two-tier (memory + disk) cache of extracted document text keyed by file content hash
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from llm_cache import ResponseCache
+
+# Set to 0 to always re-extract (e.g. when benchmarking the extractors themselves)
+EXTRACTION_CACHE_ENABLED = os.getenv("RESUME_ANALYZER_EXTRACTION_CACHE", "1") != "0"
+EXTRACTION_CACHE_DIR = os.getenv("RESUME_ANALYZER_EXTRACTION_CACHE_DIR", os.path.join(".cache", "extracted_text"))
+EXTRACTION_MEMORY_MAX_CHARS = int(os.getenv("RESUME_ANALYZER_EXTRACTION_MEMORY_CHARS", str(20 * 1024 * 1024)))
+EXTRACTION_DISK_MAX_ENTRIES = int(os.getenv("RESUME_ANALYZER_EXTRACTION_DISK_ENTRIES", "5000"))
+EXTRACTION_DISK_MAX_BYTES = int(os.getenv("RESUME_ANALYZER_EXTRACTION_DISK_BYTES", str(200 * 1024 * 1024)))
+EXTRACTION_TTL_SECONDS = int(os.getenv("RESUME_ANALYZER_EXTRACTION_TTL", str(30 * 24 * 3600)))
+
+def extraction_key(data, file_type, extractor_version):
+    """SHA-256 of the file bytes, salted with the declared type and extractor version"""
+    digest = hashlib.sha256(data)
+    digest.update(f"\x00{file_type}\x00{extractor_version}".encode('utf-8'))
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """LRU memory tier bounded by total characters, backed by a size-bounded disk tier"""
+
+    def __init__(self, memory_max_chars=EXTRACTION_MEMORY_MAX_CHARS, disk_cache=None):
+        self.memory_max_chars = memory_max_chars
+        self.disk = disk_cache or ResponseCache(
+            directory=EXTRACTION_CACHE_DIR,
+            max_entries=EXTRACTION_DISK_MAX_ENTRIES,
+            max_bytes=EXTRACTION_DISK_MAX_BYTES,
+            ttl_seconds=EXTRACTION_TTL_SECONDS
+        )
+        self._memory = OrderedDict()
+        self._memory_chars = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remember(self, key, text):
+        if len(text) > self.memory_max_chars:
+            return
+        if key in self._memory:
+            self._memory_chars -= len(self._memory.pop(key))
+        self._memory[key] = text
+        self._memory_chars += len(text)
+        while self._memory_chars > self.memory_max_chars:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_chars -= len(evicted)
+
+    def get(self, key):
+        """Return cached text for key from memory, then disk, or None"""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return text
+
+        text = self.disk.get(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def set(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        self.disk.set(key, text)
+
+    def get_or_extract(self, data, file_type, extractor_version, extract):
+        """Return cached text for these bytes, or run extract() and cache its result"""
+        if not EXTRACTION_CACHE_ENABLED:
+            return extract()
+        key = extraction_key(data, file_type, extractor_version)
+        text = self.get(key)
+        if text is None:
+            text = extract()
+            if text:
+                self.set(key, text)
+        return text
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_chars': self._memory_chars,
+            }
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+def get_extraction_cache():
+    """Return the process-wide extraction cache"""
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            _extraction_cache = ExtractionCache()
+        return _extraction_cache
@@ -0,0 +1,226 @@
+"""
+Magic-byte format sniffing and a pluggable registry of document text extractors
+"""
+import io
+import re
+import zipfile
+from html.parser import HTMLParser
+from xml.etree import ElementTree
+
+from docx_extraction import extract_docx_text
+from pdf_extraction import extract_pdf_text
+
+# How many leading bytes sniff_format looks at
+PEEK_BYTES = 4096
+
+# Format shown for an upload whose peek is inconclusive (e.g. a ZIP whose first entries are not recognisable)
+MIME_FORMATS = {
+    "text/plain": "text",
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/rtf": "rtf",
+    "text/rtf": "rtf",
+    "application/vnd.oasis.opendocument.text": "odt",
+    "text/html": "html",
+}
+
+class UnsupportedFileTypeError(ValueError):
+    """Raised when a document is not in any format with a registered extractor"""
+
+_EXTRACTORS = {}
+
+def register_extractor(fmt):
+    """Decorator registering func(data) -> text as the extractor for a sniffed format name"""
+    def decorator(func):
+        _EXTRACTORS[fmt] = func
+        return func
+    return decorator
+
+def supported_formats():
+    return sorted(_EXTRACTORS)
+
+def _looks_like_text(head):
+    if b'\x00' in head:
+        return False
+    try:
+        head.decode('utf-8')
+        return True
+    except UnicodeDecodeError as e:
+        # The peek window may cut a multi-byte character in half
+        return e.start >= len(head) - 3
+
+def sniff_format(head):
+    """Identify a document format from its leading bytes, or return None if it is not recognised"""
+    if head.startswith(b'%PDF-'):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        if b'mimetypeapplication/vnd.oasis.opendocument.text' in head:
+            return 'odt'
+        # Every OOXML file (XLSX, PPTX too) starts with [Content_Types].xml, so only a word/ entry means DOCX
+        if b'word/' in head:
+            return 'docx'
+        return 'zip'
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'text'
+    stripped = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if stripped.startswith(b'{\\rtf'):
+        return 'rtf'
+    if stripped.startswith((b'<!doctype html', b'<html')):
+        return 'html'
+    if _looks_like_text(head):
+        return 'text'
+    return None
+
+def peek_format(uploaded_file):
+    """Sniff an uploaded file's format by reading only its first bytes"""
+    position = uploaded_file.tell()
+    uploaded_file.seek(0)
+    head = uploaded_file.read(PEEK_BYTES)
+    uploaded_file.seek(position)
+    fmt = sniff_format(head)
+    return MIME_FORMATS.get(getattr(uploaded_file, 'type', None)) if fmt == 'zip' else fmt
+
+def _as_stream(data):
+    # Memory-mapped spool files are already seekable streams; wrapping them in BytesIO would copy them
+    return data if hasattr(data, 'seek') else io.BytesIO(data)
+
+def _resolve_zip_format(data):
+    # The peek was inconclusive, so look at the archive's entry names
+    try:
+        with zipfile.ZipFile(_as_stream(data)) as archive:
+            names = set(archive.namelist())
+    except zipfile.BadZipFile:
+        return None
+    if 'word/document.xml' in names:
+        return 'docx'
+    if 'content.xml' in names:
+        return 'odt'
+    return None
+
+def extract_text(data, declared_type=None):
+    """Extract text from document bytes (or an mmap of them), dispatching on sniffed content rather than the declared MIME type"""
+    fmt = sniff_format(data[:PEEK_BYTES])
+    if fmt == 'zip':
+        # The entry names decide; a spreadsheet or slide deck declared as DOCX is still unsupported
+        fmt = _resolve_zip_format(data)
+    extractor = _EXTRACTORS.get(fmt)
+    if extractor is None:
+        raise UnsupportedFileTypeError(f"Unsupported file type: {declared_type or 'unknown'}")
+    return extractor(data)
+
+@register_extractor('text')
+def extract_plain_text(data):
+    if data[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        return str(data, 'utf-16')
+    return str(data, 'utf-8-sig')
+
+@register_extractor('pdf')
+def extract_pdf(data):
+    return extract_pdf_text(data)
+
+@register_extractor('docx')
+def extract_docx(data):
+    return extract_docx_text(data)
+
+_RTF_CONTROL_RE = re.compile(r'\\([a-z]+|\*)(-?\d+)? ?|\\\'([0-9a-f]{2})|\\([{}\\])|([{}])|\r?\n', re.IGNORECASE)
+_RTF_SKIP_DESTINATIONS = {'fonttbl', 'colortbl', 'stylesheet', 'info', 'pict', 'header', 'footer', '*'}
+
+@register_extractor('rtf')
+def extract_rtf(data):
+    text = str(data, 'latin-1')
+    out = []
+    skip_depth = None
+    depth = 0
+    position = 0
+    # \ucN (per group, default 1) is how many fallback characters follow each \uN for older readers
+    fallback_counts = [1]
+    pending_fallback = 0
+    for match in _RTF_CONTROL_RE.finditer(text):
+        if skip_depth is None:
+            literal = text[position:match.start()]
+            if pending_fallback and literal:
+                skipped = min(pending_fallback, len(literal))
+                literal = literal[skipped:]
+                pending_fallback -= skipped
+            out.append(literal)
+        position = match.end()
+        word, number, hex_char, escaped, brace = match.groups()
+        if brace == '{':
+            depth += 1
+            fallback_counts.append(fallback_counts[-1])
+            pending_fallback = 0
+        elif brace == '}':
+            if skip_depth is not None and depth == skip_depth:
+                skip_depth = None
+            depth -= 1
+            if len(fallback_counts) > 1:
+                fallback_counts.pop()
+            pending_fallback = 0
+        elif skip_depth is not None:
+            continue
+        elif pending_fallback and (word or hex_char or escaped):
+            # An escaped character or control word in the fallback counts as one character
+            pending_fallback -= 1
+        elif word:
+            if word in _RTF_SKIP_DESTINATIONS:
+                skip_depth = depth
+            elif word == 'u' and number:
+                code = int(number)
+                out.append(chr(code if code >= 0 else code + 65536))
+                pending_fallback = fallback_counts[-1]
+            elif word == 'uc' and number:
+                fallback_counts[-1] = int(number)
+            elif word in ('par', 'line'):
+                out.append('\n')
+            elif word == 'tab':
+                out.append('\t')
+        elif hex_char:
+            out.append(bytes([int(hex_char, 16)]).decode('cp1252', errors='replace'))
+        elif escaped:
+            out.append(escaped)
+    if skip_depth is None:
+        out.append(text[position:][pending_fallback:])
+    # Characters outside the BMP arrive as two \uN surrogates
+    return ''.join(out).encode('utf-16', 'surrogatepass').decode('utf-16', errors='replace').strip()
+
+_ODT_TEXT_NS = '{urn:oasis:names:tc:opendocument:xmlns:text:1.0}'
+
+@register_extractor('odt')
+def extract_odt(data):
+    with zipfile.ZipFile(_as_stream(data)) as archive:
+        with archive.open('content.xml') as content:
+            lines = []
+            for _, element in ElementTree.iterparse(content):
+                if element.tag in (_ODT_TEXT_NS + 'p', _ODT_TEXT_NS + 'h'):
+                    lines.append(''.join(element.itertext()))
+                    element.clear()
+    return '\n'.join(lines).strip()
+
+class _HTMLTextParser(HTMLParser):
+    _BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article'}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+@register_extractor('html')
+def extract_html(data):
+    parser = _HTMLTextParser()
+    parser.feed(str(data, 'utf-8', errors='replace'))
+    parser.close()
+    return re.sub(r'\n\s*\n+', '\n\n', ''.join(parser.parts)).strip()
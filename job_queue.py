@@ -0,0 +1,94 @@
+"""
+Background job queue so LLM work runs outside the Streamlit script thread
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.getenv("RESUME_ANALYZER_JOB_WORKERS", "8"))
+# Finished jobs stay retrievable this long, so a reconnecting tab can still collect its result
+JOB_RETENTION_SECONDS = float(os.getenv("RESUME_ANALYZER_JOB_RETENTION", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class Job:
+    """A unit of background work; generator results are collected chunk by chunk so pages can show progress"""
+
+    def __init__(self, kind, meta=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.meta = meta or {}
+        self.status = QUEUED
+        self.chunks = []
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def is_finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def partial_text(self):
+        return ''.join(self.chunks)
+
+class JobQueue:
+    """Thread-pool backed queue of Jobs shared by every Streamlit session in the process"""
+
+    def __init__(self, max_workers=JOB_WORKERS, retention_seconds=JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func, *args, meta=None, **kwargs):
+        """Queue func(*args, **kwargs) and return the new job's id"""
+        job = Job(kind, meta)
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job.id
+
+    def get(self, job_id):
+        """Return the job for job_id, or None if it is unknown or has expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @staticmethod
+    def _run(job, func, args, kwargs):
+        job.status = RUNNING
+        try:
+            result = func(*args, **kwargs)
+            if hasattr(result, '__next__'):
+                # Drain generators here; a generator's return value (if any) becomes the job result
+                try:
+                    while True:
+                        job.chunks.append(next(result))
+                except StopIteration as stop:
+                    result = stop.value if stop.value is not None else job.partial_text
+            job.result = result
+            job.status = DONE
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+
+    def _purge(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None and job.finished < cutoff:
+                del self._jobs[job_id]
+
+_job_queue = JobQueue()
+
+def get_job_queue():
+    """Return the process-wide job queue"""
+    return _job_queue
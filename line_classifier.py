@@ -0,0 +1,89 @@
+"""
+Line classification (skip / header / bullet / body) shared by the resume exporters
+"""
+import bisect
+from itertools import accumulate
+
+SKIP = "skip"
+HEADER = "header"
+BULLET = "bullet"
+BODY = "body"
+
+# Lines containing any of these are LLM commentary rather than resume content
+COMMENTARY_PHRASES = (
+    'analysis:', 'evaluation:', 'suggestion:', 'recommendation:',
+    'improvement:', 'based on', 'here is', 'here\'s', 'this resume',
+    'the candidate', 'overall assessment', 'score:'
+)
+SECTION_KEYWORDS = (
+    'PROFESSIONAL SUMMARY', 'WORK EXPERIENCE', 'EDUCATION',
+    'SKILLS', 'CONTACT', 'CERTIFICATIONS', 'PROJECTS', 'EXPERIENCE'
+)
+BULLET_PREFIXES = ('-', '•', '*')
+
+def _compile_needles(phrases):
+    # Lowercase UTF-8 needles; a phrase containing a shorter one can never change the outcome, so it is dropped
+    needles = sorted({phrase.lower() for phrase in phrases if phrase}, key=len)
+    kept = []
+    for needle in needles:
+        if not any(shorter in needle for shorter in kept):
+            kept.append(needle)
+    return tuple(needle.encode('utf-8') for needle in kept)
+
+def _matching_lines(haystack, ends, needles):
+    """Indices of the lines (ending at the offsets in ends) that contain any needle"""
+    found = set()
+    for needle in needles:
+        position = haystack.find(needle)
+        while position != -1:
+            line = bisect.bisect_right(ends, position)
+            found.add(line)
+            # One hit per line is enough; resume the search on the next line
+            position = haystack.find(needle, ends[line])
+    return found
+
+class LineClassifier:
+    """Classifies every line of a text in one go; phrase and keyword tables are compiled once per instance
+
+    Phrases and keywords match as case-insensitive substrings (ASCII case folding). Each is located with a
+    single bytes.find scan over the whole text instead of being tested against every line.
+    """
+
+    def __init__(self, skip_phrases=COMMENTARY_PHRASES, section_keywords=SECTION_KEYWORDS, bullet_prefixes=BULLET_PREFIXES):
+        self._skip_needles = _compile_needles(skip_phrases)
+        self._header_needles = _compile_needles(section_keywords)
+        self.bullet_prefixes = tuple(bullet_prefixes)
+
+    def classify_lines(self, text):
+        """Yield (kind, stripped line) for every non-blank line of text, in order"""
+        if not text:
+            return
+        lines = text.split('\n')
+        encoded = text.encode('utf-8')
+        haystack = encoded.lower()
+        if len(encoded) == len(text):
+            ends = list(accumulate(len(line) + 1 for line in lines))
+        else:
+            # Offsets are in bytes, so multi-byte characters count for more than one
+            ends = list(accumulate(len(line) + 1 for line in encoded.split(b'\n')))
+        skipped = _matching_lines(haystack, ends, self._skip_needles)
+        headers = _matching_lines(haystack, ends, self._header_needles)
+
+        for index, line in enumerate(lines):
+            line = line.strip()
+            if not line:
+                continue
+            if index in skipped:
+                yield SKIP, line
+            elif index in headers or line.isupper():
+                yield HEADER, line
+            elif line.startswith(self.bullet_prefixes):
+                yield BULLET, line
+            else:
+                yield BODY, line
+
+    def content_lines(self, text):
+        """Yield (kind, line) for the lines that are not commentary"""
+        for kind, line in self.classify_lines(text):
+            if kind != SKIP:
+                yield kind, line
@@ -0,0 +1,158 @@
+"""
+Persistent response cache for the AI Resume Analyzer LLM calls
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+CACHE_DIR = os.getenv("RESUME_ANALYZER_CACHE_DIR", os.path.join(".cache", "llm_responses"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESUME_ANALYZER_CACHE_MAX_ENTRIES", "2000"))
+CACHE_MAX_BYTES = int(os.getenv("RESUME_ANALYZER_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+CACHE_TTL_SECONDS = int(os.getenv("RESUME_ANALYZER_CACHE_TTL", str(7 * 24 * 3600)))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def normalize_text(text):
+    """Normalize text so trivially different submissions share a cache key"""
+    if not text:
+        return ""
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+def make_cache_key(kind, model, prompt_version, *parts):
+    """Build a content-addressed cache key from the call kind, model, prompt version and inputs"""
+    digest = hashlib.sha256()
+    for part in (kind, model, prompt_version) + parts:
+        digest.update(normalize_text(str(part)).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+class ResponseCache:
+    """Disk-backed LLM response cache with TTL expiry and size-bounded LRU eviction"""
+
+    def __init__(self, directory=CACHE_DIR, max_entries=CACHE_MAX_ENTRIES,
+                 max_bytes=CACHE_MAX_BYTES, ttl_seconds=CACHE_TTL_SECONDS):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss or expired entry"""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+
+            if time.time() - entry.get('created', 0) > self.ttl_seconds:
+                self._remove(path)
+                return None
+
+            # Touch the file so eviction treats it as recently used
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            return entry.get('response')
+
+    def set(self, key, response):
+        """Store a response and evict old entries if the cache is over its limits"""
+        if not response:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'created': time.time(), 'response': response}, f)
+                os.replace(tmp_path, path)
+            except OSError:
+                self._remove(tmp_path)
+                return
+            self._evict()
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    self._remove(os.path.join(self.directory, name))
+
+    def _evict(self):
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # mtime tracks last access; anything untouched for a full TTL is stale anyway
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+def cached_completion(kind, model, prompt_version, inputs, generate):
+    """Return a cached response for inputs, calling generate() and storing the result on a miss"""
+    cache = get_response_cache()
+    key = make_cache_key(kind, model, prompt_version, *inputs)
+    response = cache.get(key)
+    if response is not None:
+        return response
+    response = generate()
+    cache.set(key, response)
+    return response
+
+def cached_stream(kind, model, prompt_version, inputs, generate_stream):
+    """Yield a cached response as one chunk, or stream generate_stream() and cache the full text once it completes"""
+    cache = get_response_cache()
+    key = make_cache_key(kind, model, prompt_version, *inputs)
+    response = cache.get(key)
+    if response is not None:
+        yield response
+        return
+
+    chunks = []
+    for chunk in generate_stream():
+        chunks.append(chunk)
+        yield chunk
+    # Only reached when the stream ran to completion, so partial output is never cached
+    cache.set(key, ''.join(chunks))
@@ -0,0 +1,95 @@
+"""
+Process-wide registry of pooled OpenAI clients for the AI Resume Analyzer
+"""
+import hashlib
+import os
+import threading
+import time
+
+CLIENT_MAX_CONNECTIONS = int(os.getenv("RESUME_ANALYZER_MAX_CONNECTIONS", "20"))
+CLIENT_MAX_KEEPALIVE = int(os.getenv("RESUME_ANALYZER_MAX_KEEPALIVE", "10"))
+CLIENT_KEEPALIVE_EXPIRY = float(os.getenv("RESUME_ANALYZER_KEEPALIVE_EXPIRY", "60"))
+CLIENT_CONNECT_TIMEOUT = float(os.getenv("RESUME_ANALYZER_CONNECT_TIMEOUT", "10"))
+CLIENT_READ_TIMEOUT = float(os.getenv("RESUME_ANALYZER_READ_TIMEOUT", "120"))
+CLIENT_IDLE_TIMEOUT = float(os.getenv("RESUME_ANALYZER_CLIENT_IDLE_TIMEOUT", "900"))
+
+class ClientRegistry:
+    """Thread-safe cache of OpenAI clients keyed by (api_key, base_url), each with its own keep-alive pool"""
+
+    def __init__(self, max_connections=CLIENT_MAX_CONNECTIONS, max_keepalive=CLIENT_MAX_KEEPALIVE,
+                 keepalive_expiry=CLIENT_KEEPALIVE_EXPIRY, connect_timeout=CLIENT_CONNECT_TIMEOUT,
+                 read_timeout=CLIENT_READ_TIMEOUT, idle_timeout=CLIENT_IDLE_TIMEOUT):
+        import httpx
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.idle_timeout = idle_timeout
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key, base_url):
+        # Hash the key so raw credentials are not used as dictionary keys
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest(), base_url
+
+    def get(self, api_key, base_url):
+        """Return the shared client for api_key and base_url, creating it on first use"""
+        key = self._key(api_key, base_url)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                import httpx
+                from openai import OpenAI
+
+                http_client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                # Retries are handled by llm_resilience.call_llm, so the SDK's own retry loop is disabled
+                client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+                entry = self._clients[key] = [client, now]
+            entry[1] = time.monotonic()
+            return entry[0]
+
+    def _evict_idle(self, now):
+        for key, (client, last_used) in list(self._clients.items()):
+            if now - last_used > self.idle_timeout:
+                del self._clients[key]
+                client.close()
+
+    def close_all(self):
+        """Close every pooled client"""
+        with self._lock:
+            for client, _ in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+# Created on first use: the OpenAI SDK and httpx are only imported once a client is actually needed
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_openai_client(api_key, base_url):
+    """Return a pooled OpenAI client shared across Streamlit sessions"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+    return _registry.get(api_key, base_url)
+
+def create_async_openai_client(api_key, base_url, max_connections=CLIENT_MAX_CONNECTIONS):
+    """Create an AsyncOpenAI client with the same pool limits and timeouts, for use inside one event loop"""
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=CLIENT_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(CLIENT_READ_TIMEOUT, connect=CLIENT_CONNECT_TIMEOUT)
+    )
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
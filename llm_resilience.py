@@ -0,0 +1,187 @@
+"""
+Resilient LLM call layer: deadlines, jittered retries, hedged requests and a circuit breaker
+"""
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CALL_DEADLINE_SECONDS = float(os.getenv("RESUME_ANALYZER_CALL_DEADLINE", "120"))
+CALL_MAX_RETRIES = int(os.getenv("RESUME_ANALYZER_CALL_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RESUME_ANALYZER_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RESUME_ANALYZER_RETRY_MAX_DELAY", "8"))
+HEDGE_ENABLED = os.getenv("RESUME_ANALYZER_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("RESUME_ANALYZER_HEDGE_PERCENTILE", "0.95"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("RESUME_ANALYZER_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("RESUME_ANALYZER_BREAKER_RESET", "30"))
+# Breakers kept for the most recently used (api_key, base_url) pairs
+BREAKER_MAX_ENTRIES = int(os.getenv("RESUME_ANALYZER_BREAKER_ENTRIES", "1024"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class LLMUnavailableError(RuntimeError):
+    """Raised when the AI provider cannot answer within the deadline or retry budget"""
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+def is_retryable(error):
+    """Return True for transient provider errors worth retrying (timeouts, connection errors, 429 and 5xx)"""
+    # Only the SDK raises its own errors, so if it was never imported the error cannot be one of them
+    openai = sys.modules.get('openai')
+    if openai is None:
+        return False
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+class CircuitBreaker:
+    """Fail fast after repeated transient failures, letting one trial call through every reset period"""
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_seconds=BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                # Half-open: this caller is the trial; re-arm so concurrent callers keep failing fast
+                self._opened_at = time.monotonic()
+                return
+        raise CircuitOpenError("The AI provider is temporarily unavailable. Please try again in a moment.")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging threshold"""
+
+    def __init__(self, window=200, min_samples=20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        """Return the q-quantile of recent latencies, or None until enough samples exist"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+_breaker = CircuitBreaker()
+_breakers = OrderedDict()
+_breakers_lock = threading.Lock()
+_trackers = {}
+_trackers_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+def get_circuit_breaker(api_key, base_url):
+    """Return the circuit breaker for one (api_key, base_url) pair
+
+    Every user brings their own key, so one key's rate limit or outage must not fail fast for the others.
+    """
+    # Hash the key so raw credentials are not used as dictionary keys, as ClientRegistry does
+    key = hashlib.sha256(api_key.encode('utf-8')).hexdigest(), base_url
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker()
+            if len(_breakers) > BREAKER_MAX_ENTRIES:
+                _breakers.popitem(last=False)
+        else:
+            _breakers.move_to_end(key)
+        return breaker
+
+def get_latency_tracker(key):
+    """Return the latency tracker for one class of calls (e.g. model and max_tokens)"""
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = LatencyTracker()
+        return tracker
+
+def _hedged_call(func, timeout, hedge_after):
+    """Call func, and if it has not finished after hedge_after seconds race a second identical call"""
+    started = time.monotonic()
+    primary = _hedge_executor.submit(func, timeout)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+        return primary.result()
+
+    pending = {primary, _hedge_executor.submit(func, timeout - hedge_after)}
+    error = None
+    while pending:
+        remaining = timeout - (time.monotonic() - started)
+        done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+        if not done:
+            import openai
+            raise openai.APITimeoutError(request=None)
+        for future in done:
+            if future.exception() is None:
+                # The slower request keeps running in the background; its result is discarded
+                return future.result()
+            error = future.exception()
+    raise error
+
+def call_llm(func, latency_key=None, deadline=CALL_DEADLINE_SECONDS, max_retries=CALL_MAX_RETRIES,
+             hedge=HEDGE_ENABLED, breaker=_breaker):
+    """Run func(timeout) under an overall deadline with jittered exponential retries, optional hedging and a circuit breaker"""
+    tracker = get_latency_tracker(latency_key)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        breaker.before_call()
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            raise LLMUnavailableError("The AI provider did not respond in time. Please try again.")
+
+        call_started = time.monotonic()
+        try:
+            hedge_after = tracker.percentile(HEDGE_PERCENTILE) if hedge else None
+            if hedge_after is not None and hedge_after < remaining:
+                result = _hedged_call(func, remaining, hedge_after)
+            else:
+                result = func(remaining)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            breaker.record_failure()
+            attempt += 1
+            # Full jitter keeps many sessions from retrying in lockstep after a provider hiccup
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            if attempt > max_retries or delay >= deadline - (time.monotonic() - started):
+                raise LLMUnavailableError("The AI provider is busy or unreachable right now. Please try again shortly.") from e
+            time.sleep(delay)
+            continue
+
+        tracker.record(time.monotonic() - call_started)
+        breaker.record_success()
+        return result
@@ -2,8 +2,6 @@
 Pricing and Subscription Page with Stripe and PayPal Integration
 """
 import streamlit as st
-import requests
-import json
 from stripe_integration import show_payment_button as show_stripe_button
 from paypal_integration import show_paypal_button
 
@@ -2,24 +2,42 @@
 PayPal Integration for AI Resume Analyzer
 """
 import streamlit as st
-import requests
 import base64
 import json
 from datetime import datetime
 
-# PayPal Configuration
-PAYPAL_CLIENT_ID = st.secrets.get("PAYPAL_CLIENT_ID", "your_paypal_client_id")
-PAYPAL_CLIENT_SECRET = st.secrets.get("PAYPAL_CLIENT_SECRET", "your_paypal_client_secret")
-PAYPAL_BASE_URL = "https://api-m.sandbox.paypal.com"  # Change to https://api-m.paypal.com for live
-PAYPAL_MODE = st.secrets.get("PAYPAL_MODE", "sandbox")  # sandbox or live
+# PayPal configuration is read from secrets on first use, not when the pricing page is imported
+_paypal_config = None
 
-if PAYPAL_MODE == "live":
-    PAYPAL_BASE_URL = "https://api-m.paypal.com"
+def get_paypal_config():
+    """PayPal credentials, API base URL and plan IDs"""
+    global _paypal_config
+    if _paypal_config is None:
+        mode = st.secrets.get("PAYPAL_MODE", "sandbox")  # sandbox or live
+        _paypal_config = {
+            'PAYPAL_CLIENT_ID': st.secrets.get("PAYPAL_CLIENT_ID", "your_paypal_client_id"),
+            'PAYPAL_CLIENT_SECRET': st.secrets.get("PAYPAL_CLIENT_SECRET", "your_paypal_client_secret"),
+            'PAYPAL_MODE': mode,
+            'PAYPAL_BASE_URL': "https://api-m.paypal.com" if mode == "live" else "https://api-m.sandbox.paypal.com",
+            # PayPal Plan IDs (create these in PayPal dashboard)
+            'PAYPAL_PLAN_IDS': {
+                'premium_monthly': st.secrets.get("PAYPAL_PREMIUM_PLAN_ID", "P-premium-plan-id"),
+                'pro_monthly': st.secrets.get("PAYPAL_PRO_PLAN_ID", "P-pro-plan-id")
+            },
+        }
+    return _paypal_config
+
+def __getattr__(name):
+    # The old PAYPAL_* constants are still importable, but only read from secrets when someone asks for them
+    if name in ('PAYPAL_CLIENT_ID', 'PAYPAL_CLIENT_SECRET', 'PAYPAL_MODE', 'PAYPAL_BASE_URL', 'PAYPAL_PLAN_IDS'):
+        return get_paypal_config()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_paypal_access_token():
     """Get PayPal access token for API calls"""
     try:
-        auth_string = f"{PAYPAL_CLIENT_ID}:{PAYPAL_CLIENT_SECRET}"
+        config = get_paypal_config()
+        auth_string = f"{config['PAYPAL_CLIENT_ID']}:{config['PAYPAL_CLIENT_SECRET']}"
         auth_bytes = auth_string.encode('ascii')
         auth_b64 = base64.b64encode(auth_bytes).decode('ascii')
         
@@ -31,8 +49,9 @@ def get_paypal_access_token():
         
         data = 'grant_type=client_credentials'
         
+        import requests
         response = requests.post(
-            f"{PAYPAL_BASE_URL}/v1/oauth2/token",
+            f"{config['PAYPAL_BASE_URL']}/v1/oauth2/token",
             headers=headers,
             data=data
         )
@@ -82,8 +101,9 @@ def create_paypal_subscription(plan_id, return_url, cancel_url):
     }
     
     try:
+        import requests
         response = requests.post(
-            f"{PAYPAL_BASE_URL}/v1/billing/subscriptions",
+            f"{get_paypal_config()['PAYPAL_BASE_URL']}/v1/billing/subscriptions",
             headers=headers,
             json=subscription_data
         )
@@ -128,8 +148,9 @@ def create_paypal_order(amount, currency="USD", description="AI Resume Analysis"
     }
     
     try:
+        import requests
         response = requests.post(
-            f"{PAYPAL_BASE_URL}/v2/checkout/orders",
+            f"{get_paypal_config()['PAYPAL_BASE_URL']}/v2/checkout/orders",
             headers=headers,
             json=order_data
         )
@@ -144,12 +165,6 @@ def create_paypal_order(amount, currency="USD", description="AI Resume Analysis"
         st.error(f"PayPal order creation failed: {str(e)}")
         return None
 
-# PayPal Plan IDs (create these in PayPal dashboard)
-PAYPAL_PLAN_IDS = {
-    'premium_monthly': st.secrets.get("PAYPAL_PREMIUM_PLAN_ID", "P-premium-plan-id"),
-    'pro_monthly': st.secrets.get("PAYPAL_PRO_PLAN_ID", "P-pro-plan-id")
-}
-
 def show_paypal_button(plan_type, amount, plan_id=None):
     """Show PayPal payment button"""
     if plan_id:  # Subscription
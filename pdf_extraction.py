@@ -0,0 +1,86 @@
+"""
+Streaming, page-parallel PDF text extraction with early page and character limits
+"""
+import io
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from prompt_compaction import PAGE_BREAK
+
+PDF_MAX_PAGES = int(os.getenv("RESUME_ANALYZER_PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("RESUME_ANALYZER_PDF_MAX_CHARS", "100000"))
+# Documents with at least this many pages (after the page cap) are split across worker processes
+PDF_PARALLEL_PAGES = int(os.getenv("RESUME_ANALYZER_PDF_PARALLEL_PAGES", "32"))
+PDF_MIN_PAGES_PER_TASK = int(os.getenv("RESUME_ANALYZER_PDF_PAGES_PER_TASK", "16"))
+PDF_WORKERS = int(os.getenv("RESUME_ANALYZER_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the Streamlit server is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+def _extract_page_range(data, start, stop):
+    """Extract pages [start, stop) from PDF bytes (runs in a worker process)"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+def _iter_pages_parallel(data, page_count):
+    pool = _get_pool()
+    # Each task re-parses the document, so use about two tasks per worker; small tasks only help early stopping
+    pages_per_task = max(PDF_MIN_PAGES_PER_TASK, math.ceil(page_count / (2 * PDF_WORKERS)))
+    futures = [
+        pool.submit(_extract_page_range, data, start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Reached when the caller stops early (character limit) - drop work that has not started yet
+        for future in futures:
+            future.cancel()
+
+def extract_pdf_text(source, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """Extract up to max_pages / max_chars of text from a PDF file object or bytes, joining pages once"""
+    from PyPDF2 import PdfReader
+
+    # File objects (including memory-mapped spool files) are parsed in place rather than copied
+    reader = PdfReader(source if hasattr(source, 'read') else io.BytesIO(source))
+    page_count = min(len(reader.pages), max_pages)
+
+    if PDF_WORKERS > 1 and page_count >= PDF_PARALLEL_PAGES:
+        # Worker processes need their own copy of the bytes
+        pages = _iter_pages_parallel(_read_bytes(source), page_count)
+    else:
+        pages = ((reader.pages[i].extract_text() or "") for i in range(page_count))
+
+    parts = []
+    total = 0
+    for text in pages:
+        parts.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    if hasattr(pages, 'close'):
+        pages.close()
+    # Page breaks let prompt compaction tell running headers/footers from repeated body lines
+    return PAGE_BREAK.join(parts)[:max_chars].strip()
@@ -0,0 +1,35 @@
+"""
+Background pipeline stages for the AI Resume Analyzer
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PIPELINE_MAX_WORKERS = int(os.getenv("RESUME_ANALYZER_PIPELINE_WORKERS", "4"))
+
+class SpeculativeStage:
+    """Run a pipeline stage in the background, sharing one in-flight future per content key across sessions"""
+
+    def __init__(self, name, func, max_workers=PIPELINE_MAX_WORKERS):
+        self.name = name
+        self.func = func
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"stage-{name}")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, *args, **kwargs):
+        """Start the stage for key unless an identical run is already in flight, and return its future"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.func, *args, **kwargs)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key, future):
+        # Finished results live in the response cache, so the in-flight entry is no longer needed
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -0,0 +1,112 @@
+"""
+Instant local match scoring of resume text against the TARGET_POSITION skill profiles
+"""
+import re
+import threading
+
+# Skill-profile term weights per target position (higher = more central to the role)
+ROLE_PROFILES = {
+    "FrontEnd Developer": {
+        "javascript": 3.0, "typescript": 2.5, "react": 3.0, "vue": 2.0, "angular": 2.0, "html": 2.5,
+        "css": 2.5, "sass": 1.0, "tailwind": 1.0, "webpack": 1.5, "vite": 1.0, "redux": 1.5,
+        "next.js": 1.5, "responsive design": 1.5, "accessibility": 1.5, "ui": 1.5, "ux": 1.0,
+        "figma": 1.0, "jest": 1.0, "cypress": 1.0, "browser": 1.0, "frontend": 2.0, "front-end": 2.0,
+    },
+    "BackEnd Developer": {
+        "python": 2.5, "java": 2.5, "go": 1.5, "golang": 2.0, "c#": 2.0, "node.js": 2.0, "django": 2.0,
+        "flask": 1.5, "fastapi": 1.5, "spring": 2.0, "sql": 2.5, "postgresql": 2.0, "mysql": 2.0,
+        "mongodb": 1.5, "redis": 1.5, "kafka": 1.5, "rest": 2.0, "api": 2.0, "graphql": 1.0,
+        "microservices": 2.0, "docker": 1.5, "kubernetes": 1.5, "aws": 1.5, "linux": 1.0,
+        "backend": 2.0, "back-end": 2.0, "distributed systems": 1.5,
+    },
+    "FullStack Developer": {
+        "javascript": 2.5, "typescript": 2.0, "react": 2.0, "vue": 1.5, "angular": 1.5, "html": 1.5,
+        "css": 1.5, "node.js": 2.5, "express": 1.5, "python": 1.5, "django": 1.5, "sql": 2.0,
+        "postgresql": 1.5, "mongodb": 1.5, "rest": 1.5, "api": 1.5, "graphql": 1.0, "docker": 1.5,
+        "aws": 1.5, "ci/cd": 1.0, "git": 1.0, "full stack": 3.0, "full-stack": 3.0, "fullstack": 3.0,
+    },
+    "Data Analytics Developer": {
+        "sql": 3.0, "python": 2.5, "r": 1.5, "pandas": 2.5, "numpy": 1.5, "excel": 1.5, "tableau": 2.0,
+        "power bi": 2.0, "looker": 1.0, "etl": 2.0, "data warehouse": 1.5, "snowflake": 1.5,
+        "bigquery": 1.5, "spark": 1.5, "airflow": 1.5, "dbt": 1.5, "statistics": 2.0,
+        "machine learning": 1.5, "data visualization": 2.0, "dashboard": 1.5, "analytics": 2.0,
+        "data analysis": 2.5, "a/b testing": 1.0,
+    },
+}
+
+# Below this best-role score the text does not look like a developer resume at all
+PRESCORE_SKIP_THRESHOLD = 3.0
+# Below this target-role score the resume is off-target and gets the cheaper model
+PRESCORE_DOWNGRADE_THRESHOLD = 5.0
+
+POSITIONS = list(ROLE_PROFILES)
+VOCABULARY = sorted({term for profile in ROLE_PROFILES.values() for term in profile})
+_TERM_INDEX = {term: i for i, term in enumerate(VOCABULARY)}
+_MAX_NGRAM = max(term.count(' ') + 1 for term in VOCABULARY)
+
+_role_weights = None
+_role_weights_lock = threading.Lock()
+
+def _get_role_weights():
+    """Role x term weight matrix and per-role totals, built (and numpy imported) on first use"""
+    global _role_weights
+    with _role_weights_lock:
+        if _role_weights is None:
+            import numpy as np
+
+            # Scaled by an IDF over roles so shared terms (e.g. "sql") count less
+            weights = np.zeros((len(POSITIONS), len(VOCABULARY)))
+            for row, position in enumerate(POSITIONS):
+                for term, weight in ROLE_PROFILES[position].items():
+                    weights[row, _TERM_INDEX[term]] = weight
+            idf = np.log((1 + len(POSITIONS)) / (1 + np.count_nonzero(weights, axis=0))) + 1.0
+            weighted = weights * idf
+            _role_weights = (weighted, weighted.sum(axis=1))
+        return _role_weights
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]')
+
+def term_counts(text):
+    """Return a vector of vocabulary term counts (unigrams up to the longest multi-word term)"""
+    import numpy as np
+
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    indices = []
+    for n in range(1, _MAX_NGRAM + 1):
+        for i in range(len(tokens) - n + 1):
+            index = _TERM_INDEX.get(' '.join(tokens[i:i + n]))
+            if index is not None:
+                indices.append(index)
+    return np.bincount(np.asarray(indices, dtype=np.intp), minlength=len(VOCABULARY))
+
+def prescore_resume(text):
+    """Score text against every target position, returning {position: score 0-100}"""
+    import numpy as np
+
+    weighted, role_norms = _get_role_weights()
+    counts = term_counts(text)
+    # Saturating term frequency: the first mention matters most, repeats add little
+    coverage = 1.0 - np.exp(-counts)
+    scores = 100.0 * (weighted @ coverage) / role_norms
+    return {position: round(float(score), 1) for position, score in zip(POSITIONS, scores)}
+
+def matched_terms(text, position, limit=10):
+    """Return the highest-weighted profile terms for position that appear in text"""
+    counts = term_counts(text)
+    profile = ROLE_PROFILES[position]
+    found = [term for term in profile if counts[_TERM_INDEX[term]]]
+    return sorted(found, key=profile.get, reverse=True)[:limit]
+
+def gate_analysis(prescores, position, premium=False):
+    """Decide how to run the LLM analysis: 'skip' for non-resumes, 'downgrade' for off-target, else 'full'
+
+    Only free-tier analyses are gated. The profiles only know common web/data stacks, so the caller should
+    let the user override a 'skip' (e.g. C++, Swift or non-English resumes score 0 everywhere).
+    """
+    if premium:
+        return 'full'
+    if max(prescores.values(), default=0.0) < PRESCORE_SKIP_THRESHOLD:
+        return 'skip'
+    if prescores.get(position, 0.0) < PRESCORE_DOWNGRADE_THRESHOLD:
+        return 'downgrade'
+    return 'full'
@@ -0,0 +1,156 @@
+"""
+Token-budgeted compaction of resume, job posting and feedback text before LLM calls
+"""
+import math
+import re
+from collections import Counter
+
+from text_normalization import PROMPT_SAFE, normalize_text
+
+# Extractors that know page boundaries (PDF) separate pages with this character
+PAGE_BREAK = '\f'
+# Lines at the top or bottom of a page are dropped as page furniture once they repeat on this many pages
+FURNITURE_MIN_REPEATS = 3
+FURNITURE_MAX_LENGTH = 80
+# Non-empty lines at each end of a page that may be headers, footers or page numbers
+FURNITURE_EDGE_LINES = 2
+TRUNCATION_MARKER = "[...]"
+# A cut line backs off to its last space only if that loses no more than this many characters
+WORD_BACKOFF_CHARS = 32
+
+_CJK_RE = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯]')
+_HYPHENATION_RE = re.compile(r'(\w)-[ \t]*\n[ \t]*(\w)')
+_INLINE_SPACE_RE = re.compile(r'[ \t\f\v ]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_DIGITS_RE = re.compile(r'\d+')
+_PAGE_NUMBER_RE = re.compile(r'^(page\s*)?\d+(\s*(of|/)\s*\d+)?$', re.IGNORECASE)
+_HEADER_RE = re.compile(r'^(#{1,6}\s+\S.*|[A-Z][A-Z0-9 &/,\-]{2,59}:?|[A-Z][\w &/,\-]{2,59}:)$')
+
+def count_tokens(text):
+    """Estimate the token count of text (CJK characters count one each, other text about four characters per token)"""
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+def _furniture_key(line):
+    # "Page 3 of 7" and "Page 4 of 7" should count as the same repeated footer
+    return _DIGITS_RE.sub('#', line.lower())
+
+def _edge_indexes(lines):
+    """Indexes of the first and last FURNITURE_EDGE_LINES non-empty lines of a page"""
+    filled = [index for index, line in enumerate(lines) if line]
+    return set(filled[:FURNITURE_EDGE_LINES] + filled[-FURNITURE_EDGE_LINES:])
+
+def compact_text(text):
+    """Remove extraction debris: hyphenated line breaks, repeated headers/footers, page numbers and extra whitespace
+
+    Headers, footers and page numbers are only looked for at page boundaries, so text without PAGE_BREAK
+    separators (pasted resumes, job postings, LLM feedback) keeps every line: repeated job titles and
+    date ranges in the body are content, not furniture.
+    """
+    if not text:
+        return ""
+
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        # Line endings, zero-width/control characters and odd spaces are handled by the shared rules
+        page = normalize_text(page, PROMPT_SAFE)
+        pages.append([_INLINE_SPACE_RE.sub(' ', line).strip() for line in page.split('\n')])
+    edges = [_edge_indexes(lines) if len(pages) > 1 else set() for lines in pages]
+
+    counts = Counter()
+    if len(pages) >= FURNITURE_MIN_REPEATS:
+        for lines, edge in zip(pages, edges):
+            # Count each header/footer once per page it appears on
+            counts.update({_furniture_key(lines[i]) for i in edge if len(lines[i]) <= FURNITURE_MAX_LENGTH})
+
+    seen_furniture = set()
+    kept = []
+    for lines, edge in zip(pages, edges):
+        for index, line in enumerate(lines):
+            if index in edge:
+                if _PAGE_NUMBER_RE.match(line):
+                    continue
+                key = _furniture_key(line)
+                if counts[key] >= FURNITURE_MIN_REPEATS:
+                    # Keep the first occurrence in case the repeated line carries real content (e.g. a name)
+                    if key in seen_furniture:
+                        continue
+                    seen_furniture.add(key)
+            kept.append(line)
+
+    text = _HYPHENATION_RE.sub(r'\1\2', '\n'.join(kept))
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+def split_sections(text):
+    """Split text into sections, each starting at a header-looking line"""
+    sections = []
+    current = []
+    for line in text.split('\n'):
+        if current and _HEADER_RE.match(line.strip()):
+            sections.append(current)
+            current = []
+        current.append(line)
+    if current:
+        sections.append(current)
+    return sections
+
+def _cut_to_tokens(line, budget):
+    """Longest prefix of line that fits in budget tokens, found by bisecting on count_tokens"""
+    low, high = 0, len(line)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(line[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return line[:low]
+
+def _truncate_lines(lines, budget):
+    kept = []
+    used = 0
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            remaining = budget - used - count_tokens(TRUNCATION_MARKER) - 1
+            if remaining > 8:
+                # A huge line (e.g. a PDF with no line breaks) would take the rest: cut it by token cost,
+                # backing off to a word boundary when there is one nearby (CJK text has none)
+                cut = _cut_to_tokens(line, remaining)
+                head, space, tail = cut.rpartition(' ')
+                if space and len(tail) <= WORD_BACKOFF_CHARS:
+                    cut = head
+                kept.append(cut)
+            kept.append(TRUNCATION_MARKER)
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+def truncate_to_budget(text, max_tokens):
+    """Trim text to roughly max_tokens, keeping the beginning of every section rather than dropping whole sections"""
+    total = count_tokens(text)
+    if not text or total <= max_tokens:
+        return text
+
+    sections = split_sections(text)
+    ratio = max_tokens / total
+    remaining = max_tokens
+    trimmed = []
+    for section in sections:
+        if remaining <= 0:
+            # Text with more headers than the budget can show: the floors used it all up
+            if trimmed[-1] != TRUNCATION_MARKER:
+                trimmed.append(TRUNCATION_MARKER)
+            break
+        section_tokens = count_tokens('\n'.join(section))
+        # A small floor keeps section headers visible under a tight budget, but never past the total
+        kept = _truncate_lines(section, min(max(int(section_tokens * ratio), 16), remaining))
+        trimmed.extend(kept)
+        remaining -= count_tokens('\n'.join(kept)) + 1
+    return '\n'.join(trimmed).strip()
+
+def compact_prompt_input(text, max_tokens):
+    """Compact text and enforce a per-call token budget"""
+    return truncate_to_budget(compact_text(text), max_tokens)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Batch PDF report export: reports rendered in a process pool and streamed into a ZIP archive
+
+Usage:
+    python report_export.py screening_results.jsonl --output reports.zip
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from datetime import datetime
+
+from analysis_schema import parse_score
+from report_templates import DEFAULT_REPORT_TEMPLATE, REPORT_TEMPLATES, get_report_template
+
+MANIFEST_NAME = "manifest.json"
+# Reports rendered (or waiting to be written) per worker; bounds memory however large the batch is
+PENDING_PER_WORKER = 2
+
+_SAFE_NAME_RE = re.compile(r'[^\w.-]+')
+
+def default_workers():
+    """Worker processes to use: the CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _warm_worker(template):
+    # Register fonts and build styles once per worker instead of on its first report
+    get_report_template(template)
+
+def render_report(analysis, position, candidate, template, report_date):
+    """Render one report (runs in a worker process); returns (pdf bytes, render seconds)"""
+    started = time.perf_counter()
+    buffer = get_report_template(template).render(analysis, position, candidate, report_date)
+    return buffer.getvalue(), time.perf_counter() - started
+
+def archive_name(candidate, used):
+    """A unique, filesystem-safe PDF name inside the archive"""
+    base = _SAFE_NAME_RE.sub('_', candidate).strip('._') or "report"
+    name = f"{base}.pdf"
+    suffix = 2
+    while name in used:
+        name = f"{base}_{suffix}.pdf"
+        suffix += 1
+    used.add(name)
+    return name
+
+def read_screening_results(path):
+    """Yield report requests from a batch_screening.py JSONL file, one line at a time"""
+    with open(path, encoding='utf-8') as results:
+        for line in results:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield {
+                'candidate': os.path.splitext(os.path.basename(record.get('file', '')))[0],
+                'position': record.get('position', ''),
+                'analysis': record.get('analysis'),
+                'status': record.get('status', 'ok'),
+                'error': record.get('error'),
+                'score': record.get('score'),
+            }
+
+def export_reports_zip(reports, output, template=DEFAULT_REPORT_TEMPLATE, workers=None):
+    """Render every report in reports and stream the PDFs into a ZIP written to output (a path or binary file)
+
+    reports is any iterable of dicts with 'candidate', 'position' and 'analysis' (optionally 'status', 'error'
+    and 'score'); it is consumed lazily. PDFs are written as soon as they finish, in completion order, and at
+    most PENDING_PER_WORKER per worker are held at a time. A manifest.json with every report's score, status
+    and timings is written last. Returns the manifest.
+    """
+    if template not in REPORT_TEMPLATES:
+        raise KeyError(f"Unknown report template: {template}")
+    workers = workers or default_workers()
+    report_date = datetime.now().strftime("%B %d, %Y")
+    started = time.perf_counter()
+    entries = []
+    used_names = set()
+    summary = {'total': 0, 'ok': 0, 'skipped': 0, 'error': 0}
+
+    def finish(future, entry):
+        try:
+            pdf, render_seconds = future.result()
+        except Exception as e:
+            entry.update(status='error', error=str(e))
+            summary['error'] += 1
+            return
+        # PDF streams are already compressed; storing them saves the CPU deflate would spend for nothing
+        archive.writestr(entry['file'], pdf, compress_type=zipfile.ZIP_STORED)
+        entry.update(status='ok', bytes=len(pdf), render_seconds=round(render_seconds, 4),
+                     completed_seconds=round(time.perf_counter() - started, 4))
+        summary['ok'] += 1
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(template,)) as pool:
+        pending = {}
+        for report in reports:
+            summary['total'] += 1
+            candidate = str(report.get('candidate') or "Candidate")
+            entry = {'candidate': candidate, 'position': report.get('position', '')}
+            entries.append(entry)
+            analysis = report.get('analysis')
+            if report.get('status', 'ok') != 'ok' or not analysis:
+                entry.update(status='skipped', error=report.get('error') or "no analysis text")
+                summary['skipped'] += 1
+                continue
+            score = report.get('score')
+            entry['score'] = score if score is not None else parse_score(analysis)
+            entry['file'] = archive_name(candidate, used_names)
+
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future, pending.pop(future))
+            future = pool.submit(render_report, analysis, entry['position'], candidate, template, report_date)
+            pending[future] = entry
+
+        for future in as_completed(list(pending)):
+            finish(future, pending.pop(future))
+
+        manifest = {
+            'template': template,
+            'report_date': report_date,
+            'workers': workers,
+            'summary': summary,
+            'total_seconds': round(time.perf_counter() - started, 4),
+            'reports': entries,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render PDF reports for batch screening results into one ZIP archive")
+    parser.add_argument("results", help="JSONL file written by batch_screening.py (--mode full)")
+    parser.add_argument("--output", default="reports.zip", help="ZIP file to write, or - for stdout")
+    parser.add_argument("--template", choices=sorted(REPORT_TEMPLATES), default=DEFAULT_REPORT_TEMPLATE,
+                        help="Report template")
+    parser.add_argument("--workers", type=int, default=None, help="Processes used for rendering (defaults to the CPU count)")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    manifest = export_reports_zip(read_screening_results(args.results), output, template=args.template, workers=args.workers)
+    summary = manifest['summary']
+    print(f"Exported {summary['ok']} of {summary['total']} reports in {manifest['total_seconds']:.1f}s "
+          f"({summary['skipped']} skipped, {summary['error']} errors) -> {args.output}", file=sys.stderr)
+    return 0 if summary['error'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+PDF report templates: fonts are registered and paragraph styles built once per process
+"""
+import io
+import os
+import re
+import threading
+import unicodedata
+from collections import deque
+from datetime import datetime
+from itertools import chain, islice
+from xml.sax.saxutils import escape
+
+from text_normalization import PDF_SAFE, normalize_text
+
+REPORT_FONT_NAME = "ReportSans"
+# Extra directory searched first for the report font files
+REPORT_FONT_DIR = os.getenv("RESUME_ANALYZER_REPORT_FONT_DIR", "")
+# (regular, bold, italic, bold italic) file names, in order of preference. Vera ships with reportlab, so
+# there is always a TTF to fall back to; it covers Latin-1 and most of Latin Extended
+FONT_FAMILIES = (
+    ('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf', 'DejaVuSans-Oblique.ttf', 'DejaVuSans-BoldOblique.ttf'),
+    ('NotoSans-Regular.ttf', 'NotoSans-Bold.ttf', 'NotoSans-Italic.ttf', 'NotoSans-BoldItalic.ttf'),
+    ('LiberationSans-Regular.ttf', 'LiberationSans-Bold.ttf', 'LiberationSans-Italic.ttf', 'LiberationSans-BoldItalic.ttf'),
+    ('Vera.ttf', 'VeraBd.ttf', 'VeraIt.ttf', 'VeraBI.ttf'),
+)
+# (file name, index in a font collection) of TrueType fonts with CJK glyphs, drawn for CJK text the report
+# font lacks. CFF-outline fonts such as Noto Sans CJK cannot be embedded by reportlab, so they are not listed
+CJK_FONT_FILES = (
+    ('wqy-zenhei.ttc', 0),
+    ('wqy-microhei.ttc', 0),
+    ('DroidSansFallbackFull.ttf', 0),
+    ('DroidSansFallback.ttf', 0),
+)
+REPORT_CJK_FONT_NAME = "ReportCJK"
+# CJK radicals, punctuation, kana, ideographs, compatibility forms and full-width forms
+CJK_RANGES = (
+    (0x2E80, 0x2FDF), (0x3000, 0x30FF), (0x3100, 0x312F), (0x31A0, 0x31FF), (0x3200, 0x33FF),
+    (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF), (0xFE30, 0xFE4F), (0xFF00, 0xFFEF),
+)
+# Hangul jamo, compatibility jamo and syllables
+HANGUL_RANGES = ((0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF))
+# reportlab's built-in (not embedded) CID fonts, used for whatever the CJK TrueType font lacks or when
+# there is none; PDF viewers substitute their own glyphs for them. The Chinese font has no Hangul
+CJK_CID_FONTS = (
+    ("STSong-Light", CJK_RANGES),
+    ("HYSMyeongJo-Medium", HANGUL_RANGES),
+)
+FONT_SEARCH_DIRS = (
+    '/usr/share/fonts/truetype/wqy',
+    '/usr/share/fonts/wqy',
+    '/usr/share/fonts/truetype/droid',
+    '/usr/share/fonts/truetype/dejavu',
+    '/usr/share/fonts/dejavu',
+    '/usr/share/fonts/truetype/noto',
+    '/usr/share/fonts/noto',
+    '/usr/share/fonts/truetype/liberation',
+    '/usr/share/fonts/liberation',
+    '/Library/Fonts',
+    'C:/Windows/Fonts',
+)
+DEFAULT_REPORT_TEMPLATE = "classic"
+# Longest body paragraph handed to reportlab; longer ones are split, preferably at sentence boundaries
+PARAGRAPH_CHAR_LIMIT = 800
+# Flowables created ahead of the one being laid out
+STORY_LOOKAHEAD = 8
+
+# name -> layout and look of the report; every style of a template is built from these once.
+# Plain values only, so listing the templates does not import reportlab
+REPORT_TEMPLATES = {
+    'classic': {
+        'label': "Classic",
+        'pagesize': 'A4',
+        'margins': (72, 72, 72, 18),  # left, right, top, bottom
+        'accent': '#00008b',
+        'title_size': 24,
+        'heading_size': 16,
+        'body_size': 11,
+        'title_alignment': 1,
+    },
+    'modern': {
+        'label': "Modern",
+        'pagesize': 'A4',
+        'margins': (60, 60, 54, 36),
+        'accent': '#0f766e',
+        'title_size': 26,
+        'heading_size': 15,
+        'body_size': 10.5,
+        'title_alignment': 0,
+    },
+    'compact': {
+        'label': "Compact (Letter)",
+        'pagesize': 'letter',
+        'margins': (48, 48, 48, 36),
+        'accent': '#000000',
+        'title_size': 18,
+        'heading_size': 13,
+        'body_size': 9.5,
+        'title_alignment': 0,
+    },
+}
+
+def iter_text_chunks(text, limit=PARAGRAPH_CHAR_LIMIT):
+    """Yield (chunk, ends_paragraph) for every blank-line separated paragraph of text, cut to at most limit chars
+
+    Cuts go after the last sentence end ('. ') that fits, else at the last space, else at the limit itself.
+    Every character is scanned a bounded number of times, so this is linear in the length of text.
+    """
+    position = 0
+    while position < len(text):
+        paragraph_end = text.find('\n\n', position)
+        if paragraph_end == -1:
+            paragraph_end = len(text)
+        paragraph = text[position:paragraph_end].strip()
+        position = paragraph_end + 2
+        start = 0
+        while len(paragraph) - start > limit:
+            window_end = start + limit
+            cut = paragraph.rfind('. ', start, window_end)
+            if cut > start:
+                end, start_next = cut + 1, cut + 2
+            else:
+                cut = paragraph.rfind(' ', start, window_end + 1)
+                if cut > start:
+                    end, start_next = cut, cut + 1
+                else:
+                    end = start_next = window_end
+            chunk = paragraph[start:end].strip()
+            if chunk:
+                yield chunk, False
+            start = start_next
+        chunk = paragraph[start:].strip()
+        if chunk:
+            yield chunk, True
+
+class FlowableStream:
+    """A story for doc.build that pulls flowables from an iterator as layout reaches them
+
+    doc.build only touches the front of its story (len, [0], del/insert at the front, short slices), so holding a
+    few flowables ahead is enough; a plain list would keep every Paragraph of a huge report alive until the end.
+    KeepWithNext chains are only honoured within the lookahead.
+    """
+
+    def __init__(self, flowables, lookahead=STORY_LOOKAHEAD):
+        self._source = iter(flowables)
+        self._buffer = deque()
+        self.lookahead = lookahead
+
+    def _fill(self, count):
+        while len(self._buffer) < count:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            self._buffer.append(flowable)
+
+    def __len__(self):
+        self._fill(self.lookahead)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else self.lookahead)
+            return list(islice(self._buffer, index.start or 0, index.stop))
+        self._fill(index + 1)
+        return self._buffer[index]
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            if index.start not in (None, 0):
+                raise IndexError("FlowableStream only removes from the front")
+            for _ in range(index.stop):
+                self._buffer.popleft()
+        elif index == 0:
+            self._buffer.popleft()
+        else:
+            raise IndexError("FlowableStream only removes from the front")
+
+    def __setitem__(self, index, flowables):
+        # doc.build puts the remainder of a split flowable back with story[0:0] = parts
+        if not (isinstance(index, slice) and index.start in (None, 0) and index.stop == 0):
+            raise IndexError("FlowableStream only inserts at the front")
+        self._buffer.extendleft(reversed(flowables))
+
+    def insert(self, index, flowable):
+        if index != 0:
+            raise IndexError("FlowableStream only inserts at the front")
+        self._buffer.appendleft(flowable)
+
+def _char_class_re(chars):
+    """A regex matching runs of the given characters, written as compact ranges"""
+    codes = sorted(map(ord, chars))
+    ranges = []
+    for code in codes:
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return re.compile('[' + ''.join(
+        re.escape(chr(start)) if start == stop else f'{re.escape(chr(start))}-{re.escape(chr(stop))}'
+        for start, stop in ranges
+    ) + ']+')
+
+class ReportFonts:
+    """The registered report font family, CJK fallback fonts, and the characters they can draw"""
+
+    def __init__(self, regular, bold, charset, fallbacks=()):
+        self.regular = regular
+        self.bold = bold
+        self.charset = charset
+        # (font name, characters) in order of preference; each character is drawn with the first font that
+        # has it, and only characters the main font lacks are drawn with a fallback
+        self.fallbacks = []
+        covered = charset
+        for name, chars in fallbacks:
+            chars = chars - covered
+            if chars:
+                self.fallbacks.append((name, chars))
+                covered = covered | chars
+        self._supported = covered
+        self._fallback_res = [(name, _char_class_re(chars)) for name, chars in self.fallbacks]
+        self._folds = {}
+
+    def escape(self, text):
+        """Escape XML special characters and switch runs of CJK text to the fallback fonts"""
+        text = escape(text)
+        # The fallback character sets are disjoint and contain no markup characters, so each pass leaves the
+        # tags of the previous ones alone
+        for name, pattern in self._fallback_res:
+            text = pattern.sub(lambda match: f'<font name="{name}">{match.group()}</font>', text)
+        return text
+
+    def fold_unsupported(self, text):
+        """Replace characters no font has a glyph for: accents are dropped where that helps, otherwise a space"""
+        missing = set(text).difference(self._supported)
+        if not missing:
+            return text
+        table = {}
+        for char in missing:
+            if char not in self._folds:
+                decomposed = unicodedata.normalize('NFKD', char)
+                kept = ''.join(part for part in decomposed if part in self._supported)
+                self._folds[char] = kept or ' '
+            table[ord(char)] = self._folds[char]
+        return text.translate(table)
+
+def _find_font_family():
+    search_dirs = _search_dirs()
+    for family in FONT_FAMILIES:
+        paths = []
+        for file_name in family:
+            path = next((os.path.join(d, file_name) for d in search_dirs if os.path.isfile(os.path.join(d, file_name))), None)
+            paths.append(path)
+        if paths[0]:
+            # Missing bold/italic faces fall back to the regular one
+            return [path or paths[0] for path in paths]
+    return None
+
+def _range_chars(ranges):
+    return frozenset(chr(code) for start, stop in ranges for code in range(start, stop + 1))
+
+def _register_cjk_fonts(search_dirs):
+    """Register the CJK fallback fonts; returns (font name, characters it draws) pairs, preferred first"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    fallbacks = []
+    cjk_chars = _range_chars(CJK_RANGES + HANGUL_RANGES)
+    for file_name, index in CJK_FONT_FILES:
+        path = next((os.path.join(d, file_name) for d in search_dirs if os.path.isfile(os.path.join(d, file_name))), None)
+        if path:
+            font = TTFont(REPORT_CJK_FONT_NAME, path, subfontIndex=index)
+            pdfmetrics.registerFont(font)
+            fallbacks.append((REPORT_CJK_FONT_NAME, cjk_chars.intersection(map(chr, font.face.charToGlyph))))
+            break
+    for name, ranges in CJK_CID_FONTS:
+        pdfmetrics.registerFont(UnicodeCIDFont(name))
+        fallbacks.append((name, _range_chars(ranges)))
+    return fallbacks
+
+def _search_dirs():
+    import reportlab
+
+    bundled = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+    return ((REPORT_FONT_DIR,) if REPORT_FONT_DIR else ()) + FONT_SEARCH_DIRS + (bundled,)
+
+def _register_fonts():
+    from reportlab import rl_config
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    # Plain zlib streams: the ASCII85 wrapper only keeps PDFs 7-bit clean, at the cost of a pure-Python
+    # encoding pass over every page and the embedded font subsets, and a quarter more bytes
+    rl_config.useA85 = 0
+    fallbacks = _register_cjk_fonts(_search_dirs())
+    paths = _find_font_family()
+    if paths is None:
+        # No TTF at all: the built-in Helvetica only covers Latin-1
+        return ReportFonts('Helvetica', 'Helvetica-Bold', frozenset(map(chr, range(256))), fallbacks)
+    names = [REPORT_FONT_NAME, f"{REPORT_FONT_NAME}-Bold", f"{REPORT_FONT_NAME}-Italic", f"{REPORT_FONT_NAME}-BoldItalic"]
+    regular = None
+    for name, path in zip(names, paths):
+        font = TTFont(name, path)
+        pdfmetrics.registerFont(font)
+        regular = regular or font
+    pdfmetrics.registerFontFamily(REPORT_FONT_NAME, normal=names[0], bold=names[1], italic=names[2], boldItalic=names[3])
+    # Layout characters are never drawn, so they count as supported
+    charset = frozenset(map(chr, regular.face.charToGlyph)) | frozenset('\n\r\t')
+    return ReportFonts(names[0], names[1], charset, fallbacks)
+
+class ReportTemplate:
+    """A named report layout; its paragraph styles are built once, when the template is first used"""
+
+    def __init__(self, name, fonts, label, pagesize, margins, accent, title_size, heading_size, body_size, title_alignment):
+        from reportlab.lib import colors, pagesizes
+        from reportlab.lib.styles import ParagraphStyle
+
+        self.name = name
+        self.label = label
+        self.fonts = fonts
+        self.pagesize = getattr(pagesizes, pagesize)
+        self.margins = margins
+        accent = colors.HexColor(accent)
+        self.title_style = ParagraphStyle(
+            f'{name}-title', fontName=fonts.bold, fontSize=title_size, leading=title_size * 1.2,
+            textColor=accent, spaceAfter=30, alignment=title_alignment
+        )
+        self.heading_style = ParagraphStyle(
+            f'{name}-heading', fontName=fonts.bold, fontSize=heading_size, leading=heading_size * 1.2,
+            textColor=accent, spaceAfter=12, spaceBefore=20
+        )
+        self.normal_style = ParagraphStyle(
+            f'{name}-normal', fontName=fonts.regular, fontSize=body_size, leading=body_size * 1.25,
+            textColor=colors.black, spaceAfter=12
+        )
+        self.footer_style = ParagraphStyle(
+            f'{name}-footer', fontName=fonts.regular, fontSize=body_size - 1, leading=(body_size - 1) * 1.25,
+            textColor=colors.grey, alignment=1
+        )
+
+    def markup(self, text):
+        """Paragraph-safe markup for plain text: unsupported glyphs folded, XML special characters escaped"""
+        return self.fonts.escape(self.fonts.fold_unsupported(text))
+
+    def body_flowables(self, text):
+        """Lazily yield paragraphs for the analysis text, long paragraphs split at sentence boundaries"""
+        from reportlab.platypus import Paragraph, Spacer
+
+        # Folding is done on the whole text once; escaping per chunk so cuts never land inside an entity
+        for chunk, ends_paragraph in iter_text_chunks(self.fonts.fold_unsupported(text)):
+            yield Paragraph(self.fonts.escape(chunk), self.normal_style)
+            yield Spacer(1, 12 if ends_paragraph else 8)
+
+    def render(self, analysis_result, target_position, candidate_name="Candidate", report_date=None):
+        """Render the analysis report and return it as a BytesIO positioned at the start"""
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+        buffer = io.BytesIO()
+        left, right, top, bottom = self.margins
+        doc = SimpleDocTemplate(
+            buffer, pagesize=self.pagesize, leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom,
+            title="AI Resume Analysis Report", author="AI Resume Analyzer"
+        )
+        report_date = report_date or datetime.now().strftime("%B %d, %Y")
+
+        header = [
+            Paragraph("AI Resume Analysis Report", self.title_style),
+            Spacer(1, 20),
+            Paragraph(f"<b>Report Generated:</b> {self.markup(report_date)}", self.normal_style),
+            Paragraph(f"<b>Target Position:</b> {self.markup(str(target_position))}", self.normal_style),
+            Paragraph(f"<b>Candidate:</b> {self.markup(str(candidate_name))}", self.normal_style),
+            Spacer(1, 30),
+            Paragraph("Analysis Results", self.heading_style),
+        ]
+        footer = [
+            Spacer(1, 50),
+            Paragraph("Generated by AI Resume Analyzer", self.footer_style),
+            Paragraph("Contact: xzhu@cofomo.com", self.footer_style),
+        ]
+        # Text is escaped rather than trusted as markup, so stray '<' or '&' can no longer break the build.
+        # Body paragraphs are created as layout reaches them instead of all up front
+        body = self.body_flowables(normalize_text(analysis_result, PDF_SAFE))
+        doc.build(FlowableStream(chain(header, body, footer)))
+        buffer.seek(0)
+        return buffer
+
+_report_fonts = None
+_templates = {}
+_templates_lock = threading.Lock()
+
+def get_report_template(name=DEFAULT_REPORT_TEMPLATE):
+    """Return the named template, registering the report fonts on first use"""
+    global _report_fonts
+    with _templates_lock:
+        template = _templates.get(name)
+        if template is None:
+            if name not in REPORT_TEMPLATES:
+                raise KeyError(f"Unknown report template: {name}")
+            if _report_fonts is None:
+                _report_fonts = _register_fonts()
+            template = _templates[name] = ReportTemplate(name, _report_fonts, **REPORT_TEMPLATES[name])
+        return template
@@ -4,428 +4,93 @@ AI Agnets CV analyzer
 
 """
 from logging import PlaceHolder
-import re
 import streamlit as st
-from openai import OpenAI
-from PyPDF2 import PdfReader
-from docx import Document
-import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from datetime import datetime
+import time
+from llm_resilience import LLMUnavailableError
+from prescoring import gate_analysis, matched_terms, prescore_resume
+from job_queue import FAILED, get_job_queue
+from extractors import UnsupportedFileTypeError, peek_format
+from report_templates import REPORT_TEMPLATES
+from docx_templates import DOCX_TEMPLATES, docx_template_names
+from resume_engine import (
+    FALLBACK_MODEL_NAME, MODEL_NAME, SUPPORTED_FORMATS_LABEL, TARGET_POSITION, UPLOAD_TYPES,
+    analyze_resume_with_ai, optimize_resume_for_job, plan_features, read_file_text, report_pdf_bytes,
+    resume_docx_bytes, resume_txt_bytes, start_job_analysis
+)
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 
-API_BASE_URL="https://api.siliconflow.cn/v1"
-TARGET_POSITION=["FrontEnd Developer","BackEnd Developer","FullStack Developer","Data Analytics Developer"]
+# Seconds between reruns while a background job is in progress
+JOB_POLL_SECONDS=1.0
 
-def clean_text_for_pdf(text):
-    """Clean text content to make it safe for PDF generation"""
-    if not text:
-        return ""
-    
-    # Remove HTML tags
-    import re
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Replace markdown table syntax with plain text
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        # Skip table separator lines (|-------|-------|
-        if re.match(r'^\s*\|[-\s\|]+\|\s*$', line):
-            continue
-        
-        # Convert table rows to simple text
-        if '|' in line and line.strip().startswith('|'):
-            # Remove leading/trailing | and split by |
-            cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
-            if cells:  # Only process if there are cells
-                cleaned_lines.append(' - '.join(filter(None, cells)))
-        else:
-            # Regular line - just clean up
-            cleaned_lines.append(line)
-    
-    text = '\n'.join(cleaned_lines)
-    
-    # Replace common problematic characters
-    text = text.replace('•', '* ')  # Replace bullet points
-    text = text.replace('✅', '[YES] ')  # Replace checkmarks
-    text = text.replace('❌', '[NO] ')   # Replace X marks
-    text = text.replace('🔍', '[FOCUS] ')  # Replace magnifying glass
-    text = text.replace('💡', '[TIP] ')   # Replace lightbulb
-    text = text.replace('🌟', '[STAR] ')  # Replace star
-    text = text.replace('🚀', '[GROWTH] ')  # Replace rocket
-    
-    # Remove any remaining emoji or special Unicode characters
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-    
-    # Clean up extra whitespace
-    text = re.sub(r'\n\s*\n', '\n\n', text)  # Multiple newlines to double
-    text = re.sub(r' +', ' ', text)  # Multiple spaces to single
-    
-    return text.strip()
+def release_upload(uploaded_file):
+    """Drop Streamlit's in-memory copy of an upload so a long-lived session doesn't pin the raw bytes"""
+    ctx = get_script_run_ctx()
+    # Same cleanup st.chat_input does for its attachments; other upload managers keep their own storage
+    if ctx is not None and isinstance(ctx.uploaded_file_mgr, MemoryUploadedFileManager):
+        ctx.uploaded_file_mgr.remove_file(session_id=ctx.session_id, file_id=uploaded_file.file_id)
+    uploaded_file.close()
 
-def extract_file_content(uploaded_file):
-    if uploaded_file is None: 
-        return None 
-    
+def extract_upload(uploaded_file, paste_hint):
+    """Extract an upload once, keeping only its text (or why there is none), and release the upload"""
+    upload = {'name': uploaded_file.name, 'format': peek_format(uploaded_file), 'text': None, 'error': None}
     try:
-        if uploaded_file.type == "text/plain":
-            # Handle TXT files
-            file_content = uploaded_file.read()
-            return file_content.decode("utf-8")
-        
-        elif uploaded_file.type == "application/pdf":
-            # Handle PDF files
-            pdf_reader = PdfReader(uploaded_file)
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
-            return text_content.strip()
-        
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            # Handle DOCX files
-            doc = Document(uploaded_file)
-            text_content = ""
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
-            return text_content.strip()
-        
+        text = read_file_text(uploaded_file, release=release_upload)
+        if text.strip():
+            upload['text'] = text
         else:
-            return f"Unsupported file type: {uploaded_file.type}. Please upload a TXT, PDF, or DOCX file."
-    
+            # e.g. a scanned PDF with no text layer
+            upload['error'] = f"No text could be extracted from {uploaded_file.name}. If it is a scanned document, please paste the {paste_hint} instead."
+    except UnsupportedFileTypeError:
+        upload['error'] = f"{uploaded_file.name} is not a {SUPPORTED_FORMATS_LABEL} document. Please check the file and try again."
     except Exception as e:
-        return f"Error reading file: {str(e)}. Please ensure the file is not corrupted and try again."
+        upload['error'] = f"Error reading file: {str(e)}. Please ensure the file is not corrupted and try again."
+    finally:
+        release_upload(uploaded_file)
+    return upload
+
+def load_resume_upload(uploaded_file):
+    """Extract an uploaded resume into session state"""
+    st.session_state.resume_upload = extract_upload(uploaded_file, "resume text")
 
-def get_resume_content(uploaded_file,resume_text):
-    if uploaded_file:
-        return extract_file_content(uploaded_file)
+def load_job_upload(uploaded_file):
+    """Extract an uploaded job posting into session state"""
+    st.session_state.job_upload = extract_upload(uploaded_file, "job description")
+
+def get_resume_content(resume_upload,resume_text):
+    if resume_upload and resume_upload['text']:
+        return resume_upload['text']
     elif resume_text:
         return resume_text
     else:
         return None
 
-def analyze_resume_with_ai(resume_text,target_postion,api_key):
-    if not api_key or not api_key.strip():
-        return "Enter your API key"
-
-    client = OpenAI(api_key=api_key,base_url=API_BASE_URL)
-    prompt = f"you are senior HR analyst assistant, taking account of the resume submitted by the candidate, you need to analyze the resume to validate if the candidate qualifies for the requirements listed in {target_postion}: \n based on{resume_text}please provide:1,overall assessment score (1-100);2,detailed analysis with suggestion for improvements; 3,list the candidate major outstandings, together with personalised advice on his/her future professional path"
-
-    response = client.chat.completions.create(
-        model="Qwen/Qwen3-Next-80B-A3B-Instruct",
-        messages=[
-            {"role":"system","content":"you act as an assistant like a senior professional to evaluate the candidate's resume with insightful analysis and advice"}
-           ,{"role":"user","content":prompt}
-        ],
-        max_tokens = 1500
-    )
-    return response.choices[0].message.content
-
-def analyze_job_posting(job_description, api_key):
-    """Analyze job posting to extract key requirements and skills"""
-    if not api_key or not api_key.strip():
-        return "Enter your API key"
+def current_plan():
+    """The visitor's plan: the subscription set by the account pages, or premium when premium access is enabled here"""
+    plan=st.session_state.get('user_subscription','free')
+    if plan == 'free' and st.session_state.is_premium_user:
+        return 'premium'
+    return plan
 
-    client = OpenAI(api_key=api_key, base_url=API_BASE_URL)
-    prompt = f"""You are a senior HR analyst. Analyze the following job posting and extract:
-    1. Key required skills and technologies
-    2. Preferred qualifications
-    3. Soft skills and personality traits
-    4. Experience level requirements
-    5. Main responsibilities and duties
-    6. Keywords that should appear in a tailored resume
-    
-    Job Posting:
-    {job_description}
-    
-    Please provide a structured analysis that can be used to optimize a resume for this position."""
-
-    response = client.chat.completions.create(
-        model="Qwen/Qwen3-Next-80B-A3B-Instruct",
-        messages=[
-            {"role": "system", "content": "you act as an expert HR analyst who understands job requirements and can extract key information for resume optimization"},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=1500
-    )
-    return response.choices[0].message.content
+def render_prescores(prescores, target_position, content=None):
+    """Show the local skill-match scores for every target position"""
+    st.markdown("#### ⚡ Instant Skill Match")
+    columns = st.columns(len(prescores))
+    for column, (position, score) in zip(columns, prescores.items()):
+        label = f"🎯 {position}" if position == target_position else position
+        column.metric(label, f"{score:.0f}/100")
+    if content:
+        terms = matched_terms(content, target_position)
+        if terms:
+            st.caption("Matched skills: " + ", ".join(terms))
 
-def rewrite_resume_for_job(original_resume, job_analysis, evaluation_feedback, api_key):
-    """Rewrite resume to better match job requirements based on evaluation feedback"""
-    if not api_key or not api_key.strip():
-        return "Enter your API key"
+def render_downgrade_notice(meta):
+    """Tell free users when an off-target resume was analyzed with the faster fallback model"""
+    if meta and meta.get('downgraded'):
+        st.info(f"ℹ️ Few {meta['target_position']} skills were found in this resume, so a faster model was used for the analysis. Premium analyses always use the full model.")
 
-    client = OpenAI(api_key=api_key, base_url=API_BASE_URL)
-    prompt = f"""You are a professional resume writer with expertise in ATS optimization and job matching.
-    
-    Based on the following information, rewrite the candidate's resume to better match the job requirements:
-    
-    ORIGINAL RESUME:
-    {original_resume}
-    
-    JOB REQUIREMENTS ANALYSIS:
-    {job_analysis}
-    
-    EVALUATION FEEDBACK:
-    {evaluation_feedback}
-    
-    IMPORTANT: Provide ONLY the complete, polished resume content in standard resume format. Do NOT include:
-    - Explanatory text or commentary
-    - Analysis or evaluation remarks
-    - Suggestions or recommendations
-    - Meta-commentary about the changes made
-    
-    The output should be a clean, professional resume with:
-    1. Contact information section
-    2. Professional summary/objective
-    3. Work experience with bullet points
-    4. Education section
-    5. Skills section
-    6. Any relevant additional sections (certifications, projects, etc.)
-    
-    Optimize the resume by:
-    - Using keywords from job requirements
-    - Highlighting relevant experience and skills
-    - Improving ATS compatibility
-    - Quantifying achievements where possible
-    - Tailoring content to the specific role
-    
-    Output the resume content ready for immediate use and submission."""
-
-    response = client.chat.completions.create(
-        model="Qwen/Qwen3-Next-80B-A3B-Instruct",
-        messages=[
-            {"role": "system", "content": "You are an expert resume writer who creates ATS-optimized, compelling resumes that match job requirements perfectly"},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=2500
-    )
-    return response.choices[0].message.content
-
-def generate_pdf_report(analysis_result, target_position, candidate_name="Candidate"):
-    """Generate a PDF report from the analysis results"""
-    try:
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.darkblue,
-            spaceAfter=30,
-            alignment=1  # Center alignment
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.darkblue,
-            spaceAfter=12,
-            spaceBefore=20
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=12,
-            textColor=colors.black
-        )
-        
-        # Build the story
-        story = []
-        
-        # Title
-        story.append(Paragraph("AI Resume Analysis Report", title_style))
-        story.append(Spacer(1, 20))
-        
-        # Header Information
-        current_date = datetime.now().strftime("%B %d, %Y")
-        story.append(Paragraph(f"<b>Report Generated:</b> {current_date}", normal_style))
-        story.append(Paragraph(f"<b>Target Position:</b> {target_position}", normal_style))
-        story.append(Paragraph(f"<b>Candidate:</b> {candidate_name}", normal_style))
-        story.append(Spacer(1, 30))
-        
-        # Analysis Results
-        story.append(Paragraph("Analysis Results", heading_style))
-        
-        # Clean the analysis result text first
-        cleaned_analysis = clean_text_for_pdf(analysis_result)
-        
-        # Split analysis result into paragraphs and format
-        analysis_paragraphs = cleaned_analysis.split('\n\n')
-        for paragraph in analysis_paragraphs:
-            if paragraph.strip():
-                # Process each paragraph safely
-                paragraph_text = paragraph.strip()
-                
-                # Split long paragraphs at sentence boundaries to avoid overflow
-                sentences = paragraph_text.split('. ')
-                current_paragraph = ""
-                
-                for i, sentence in enumerate(sentences):
-                    if len(current_paragraph + sentence) > 800:  # Prevent overly long paragraphs
-                        if current_paragraph:
-                            story.append(Paragraph(current_paragraph.strip() + '.', normal_style))
-                            story.append(Spacer(1, 8))
-                        current_paragraph = sentence
-                    else:
-                        if i < len(sentences) - 1:
-                            current_paragraph += sentence + '. '
-                        else:
-                            current_paragraph += sentence
-                
-                # Add the final paragraph
-                if current_paragraph.strip():
-                    story.append(Paragraph(current_paragraph.strip(), normal_style))
-                    story.append(Spacer(1, 12))
-        
-        # Footer
-        story.append(Spacer(1, 50))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.grey,
-            alignment=1  # Center alignment
-        )
-        story.append(Paragraph("Generated by AI Resume Analyzer", footer_style))
-        story.append(Paragraph("Contact: xzhu@cofomo.com", footer_style))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-    
-    except Exception as e:
-        # If PDF generation fails, create a simple fallback PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        styles = getSampleStyleSheet()
-        
-        story = []
-        story.append(Paragraph("AI Resume Analysis Report", styles['Title']))
-        story.append(Spacer(1, 20))
-        story.append(Paragraph(f"Target Position: {target_position}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        story.append(Paragraph("Analysis Results:", styles['Heading2']))
-        story.append(Spacer(1, 10))
-        
-        # Add simplified analysis text
-        simplified_text = clean_text_for_pdf(analysis_result)
-        # Split into smaller chunks to avoid issues
-        chunks = [simplified_text[i:i+1000] for i in range(0, len(simplified_text), 1000)]
-        
-        for chunk in chunks:
-            if chunk.strip():
-                story.append(Paragraph(chunk.strip(), styles['Normal']))
-                story.append(Spacer(1, 10))
-        
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-
-def generate_resume_docx(resume_content, filename="Resume"):
-    """Generate a clean DOCX file from resume content"""
-    try:
-        from docx import Document
-        from docx.shared import Inches
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        
-        # Create a new document
-        doc = Document()
-        
-        # Set document margins
-        sections = doc.sections
-        for section in sections:
-            section.top_margin = Inches(0.5)
-            section.bottom_margin = Inches(0.5)
-            section.left_margin = Inches(0.75)
-            section.right_margin = Inches(0.75)
-        
-        # Clean the content - remove any remaining analysis commentary
-        lines = resume_content.split('\n')
-        clean_lines = []
-        
-        skip_phrases = [
-            'analysis:', 'evaluation:', 'suggestion:', 'recommendation:', 
-            'improvement:', 'based on', 'here is', 'here\'s', 'this resume',
-            'the candidate', 'overall assessment', 'score:'
-        ]
-        
-        for line in lines:
-            line = line.strip()
-            if line and not any(phrase.lower() in line.lower() for phrase in skip_phrases):
-                clean_lines.append(line)
-        
-        # Process each line and add to document
-        current_section = None
-        
-        for line in clean_lines:
-            if not line:
-                continue
-                
-            # Check if it's a section header (all caps or title case with colons)
-            if (line.isupper() or 
-                any(keyword in line.upper() for keyword in 
-                    ['PROFESSIONAL SUMMARY', 'WORK EXPERIENCE', 'EDUCATION', 
-                     'SKILLS', 'CONTACT', 'CERTIFICATIONS', 'PROJECTS', 'EXPERIENCE'])):
-                # Add section header
-                p = doc.add_paragraph()
-                run = p.add_run(line)
-                run.bold = True
-                run.font.size = Inches(0.15)
-                p.space_after = Inches(0.1)
-                current_section = line
-            elif line.startswith('-') or line.startswith('•') or line.startswith('*'):
-                # Add bullet point
-                p = doc.add_paragraph(line[1:].strip(), style='List Bullet')
-                p.space_after = Inches(0.05)
-            else:
-                # Add regular paragraph
-                p = doc.add_paragraph(line)
-                p.space_after = Inches(0.08)
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer
-        
-    except Exception as e:
-        # Fallback: return as plain text
-        return io.BytesIO(resume_content.encode('utf-8'))
-
-def generate_resume_txt(resume_content):
-    """Generate a clean TXT file from resume content"""
-    # Clean the content - remove any analysis commentary
-    lines = resume_content.split('\n')
-    clean_lines = []
-    
-    skip_phrases = [
-        'analysis:', 'evaluation:', 'suggestion:', 'recommendation:', 
-        'improvement:', 'based on', 'here is', 'here\'s', 'this resume',
-        'the candidate', 'overall assessment', 'score:', 'commentary:',
-        'note:', 'explanation:'
-    ]
-    
-    for line in lines:
-        line = line.strip()
-        if line and not any(phrase.lower() in line.lower() for phrase in skip_phrases):
-            clean_lines.append(line)
-    
-    clean_content = '\n'.join(clean_lines)
-    return io.BytesIO(clean_content.encode('utf-8'))
-
-def handle_analysis_click(uploaded_file,resume_text, target_position, api_key) :
+def handle_analysis_click(resume_upload,resume_text, target_position, api_key, force=False) :
     # Check usage limits for non-premium users
     if not st.session_state.is_premium_user:
         if st.session_state.usage_count >= 3:
@@ -436,23 +101,113 @@ def handle_analysis_click(uploaded_file,resume_text, target_position, api_key) :
             st.markdown("[**📧 Contact us to upgrade**](mailto:upgrade@your-domain.com)")
             return None
     
-    content=get_resume_content(uploaded_file,resume_text)
+    st.session_state.analysis_skipped=False
+    content=get_resume_content(resume_upload,resume_text)
     if not content:
-        st.warning("Please submit your resume file or input resume text")
+        if resume_upload:
+            st.warning("The uploaded file could not be read. Please upload another file or input resume text")
+        else:
+            st.warning("Please submit your resume file or input resume text")
         return
+    if resume_upload and not resume_upload['text']:
+        st.info("ℹ️ The uploaded file could not be read, so the resume text entered manually is analyzed instead.")
+    
+    # Local pre-score: instant feedback, and gates the LLM call for off-target documents
+    prescores=prescore_resume(content)
+    # Progress output lives in a placeholder that the results section replaces once the analysis is done
+    stream_placeholder = st.empty()
+    with stream_placeholder.container():
+        render_prescores(prescores,target_position,content)
+    gate='full' if force else gate_analysis(prescores,target_position,premium=st.session_state.is_premium_user)
+    if gate == 'skip':
+        # main() shows the warning with an "Analyze anyway" button, which calls back in with force=True
+        st.session_state.analysis_skipped=True
+        return None
+    model=FALLBACK_MODEL_NAME if gate == 'downgrade' else MODEL_NAME
+    st.session_state.prescores=prescores
     
     # Increment usage counter for non-premium users
     if not st.session_state.is_premium_user:
         st.session_state.usage_count += 1
         
-    with st.spinner("working on your file..."):
-        analysis_result=analyze_resume_with_ai(content,target_position,api_key)
-        st.session_state.analysis_result=analysis_result
-        st.session_state.target_position=target_position
-        st.session_state.original_resume_content=content  # Store original content
-    st.success("Analysis Completed Successfully")
+    # Run the analysis in the background; poll_analysis_job renders progress and collects the result
+    job_id=get_job_queue().submit(
+        "analysis", analyze_resume_with_ai, content, target_position, api_key, stream=True, model=model,
+        meta={'target_position': target_position, 'content': content, 'prescores': prescores, 'downgraded': gate == 'downgrade'}
+    )
+    st.session_state.analysis_job_id=job_id
+    st.session_state.evaluation_in_progress=True
+    stream_placeholder.empty()
     return True
 
+def refund_usage():
+    # Don't charge free users for an analysis the provider never delivered
+    if not st.session_state.is_premium_user:
+        st.session_state.usage_count=max(0, st.session_state.usage_count-1)
+
+def poll_analysis_job():
+    """Show progress of the background analysis and store its result once done; returns True while it is still running"""
+    # Job ids live only in this session's state: the job meta holds the submitted resume, so it is never
+    # handed to another session (e.g. through a shared URL)
+    job_id=st.session_state.analysis_job_id
+    if not job_id:
+        return False
+    job=get_job_queue().get(job_id)
+    if job is None:
+        st.session_state.analysis_job_id=None
+        st.session_state.evaluation_in_progress=False
+        return False
+    
+    if not job.is_finished:
+        render_prescores(job.meta['prescores'],job.meta['target_position'],job.meta['content'])
+        render_downgrade_notice(job.meta)
+        with st.expander("📋 Detailed Analysis Report", expanded=True):
+            st.markdown(job.partial_text or "⏳ working on your file...")
+        return True
+    
+    st.session_state.analysis_job_id=None
+    st.session_state.evaluation_in_progress=False
+    if job.status == FAILED:
+        refund_usage()
+        message=str(job.error) if isinstance(job.error, LLMUnavailableError) else f"Error during analysis: {job.error}"
+        st.error(f"❌ {message}")
+        return False
+    st.session_state.analysis_result=job.result
+    st.session_state.target_position=job.meta['target_position']
+    st.session_state.original_resume_content=job.meta['content']  # Store original content
+    st.session_state.prescores=job.meta['prescores']
+    st.session_state.analysis_meta=job.meta
+    st.success("Analysis Completed Successfully")
+    return False
+
+def poll_optimize_job():
+    """Show progress of the background resume optimization and store its results once done; returns True while running"""
+    job_id=st.session_state.optimize_job_id
+    if not job_id:
+        return False
+    job=get_job_queue().get(job_id)
+    if job is None:
+        st.session_state.optimize_job_id=None
+        return False
+    
+    if not job.is_finished:
+        if job.chunks:
+            with st.expander("📄 Optimizing your resume for this job...", expanded=True):
+                st.markdown(job.partial_text)
+        else:
+            st.info("🔍 Analyzing job requirements...")
+        return True
+    
+    st.session_state.optimize_job_id=None
+    if job.status == FAILED:
+        message=str(job.error) if isinstance(job.error, LLMUnavailableError) else f"Error during optimization: {job.error}"
+        st.error(f"❌ {message}")
+        return False
+    st.session_state.job_analysis=job.result['job_analysis']
+    st.session_state.optimized_resume=job.result['optimized_resume']
+    st.success("🎉 Resume optimized successfully!")
+    return False
+
 def main():
     st.set_page_config(page_title="AI Resum Analyzer",page_icon=":memo:",layout="wide")
     if "analysis_result" not in st.session_state:
@@ -463,12 +218,30 @@ def main():
         st.session_state.optimized_resume=None
     if "original_resume_content" not in st.session_state:
         st.session_state.original_resume_content=None
+    if "prescores" not in st.session_state:
+        st.session_state.prescores=None
+    if "resume_upload" not in st.session_state:
+        st.session_state.resume_upload=None
+    if "resume_uploader_key" not in st.session_state:
+        st.session_state.resume_uploader_key=0
+    if "job_upload" not in st.session_state:
+        st.session_state.job_upload=None
+    if "job_uploader_key" not in st.session_state:
+        st.session_state.job_uploader_key=0
     if "evaluation_in_progress" not in st.session_state:
         st.session_state.evaluation_in_progress=False
+    if "analysis_job_id" not in st.session_state:
+        st.session_state.analysis_job_id=None
+    if "optimize_job_id" not in st.session_state:
+        st.session_state.optimize_job_id=None
     if "usage_count" not in st.session_state:
         st.session_state.usage_count = 0
     if "is_premium_user" not in st.session_state:
         st.session_state.is_premium_user = False
+    if "analysis_skipped" not in st.session_state:
+        st.session_state.analysis_skipped=False
+    if "analysis_meta" not in st.session_state:
+        st.session_state.analysis_meta=None
     with st.sidebar:
         st.markdown("AI Resume Analyzer will help you to evaluate your candidateship based on your resume and your target position")
         
@@ -517,11 +290,25 @@ def main():
         target_position=st.selectbox("the position you are applying for",TARGET_POSITION,help="Select from list")
         
         st.markdown("#### Upload Resume File")
-        st.info("📁 **Supported formats**: TXT, PDF, DOCX files")
-        uploaded_file=st.file_uploader("Submit Resume File",type=["txt","pdf","docx"],help="Supports TXT, PDF, and DOCX formats")
+        st.info(f"📁 **Supported formats**: {SUPPORTED_FORMATS_LABEL} files")
+        uploaded_file=st.file_uploader("Submit Resume File",type=UPLOAD_TYPES,help=f"Supports {SUPPORTED_FORMATS_LABEL} formats",key=f"resume_file_{st.session_state.resume_uploader_key}")
         
         if uploaded_file is not None:
-            st.success(f"✅ File uploaded: {uploaded_file.name} ({uploaded_file.type})")
+            # Extract once and keep only the text; a fresh uploader key clears the widget whose file was released
+            load_resume_upload(uploaded_file)
+            st.session_state.resume_uploader_key+=1
+            st.rerun()
+        
+        resume_upload=st.session_state.resume_upload
+        if resume_upload:
+            if resume_upload['error']:
+                st.error(f"❌ {resume_upload['error']}")
+            else:
+                detected_format=(resume_upload['format'] or 'unknown').upper()
+                st.success(f"✅ File uploaded: {resume_upload['name']} (detected: {detected_format}, {len(resume_upload['text']):,} characters extracted)")
+            if st.button("✖ Remove uploaded file"):
+                st.session_state.resume_upload=None
+                st.rerun()
     
     with col_input2:
         st.markdown("#### Or Enter Resume Text Manually")
@@ -529,13 +316,21 @@ def main():
     
     # Evaluate button (full width)
     if st.button("🔍 Evaluate Resume Now",type="primary",use_container_width=True):
-        handle_analysis_click(uploaded_file,resume_text,target_position,api_key)
+        handle_analysis_click(resume_upload,resume_text,target_position,api_key)
+    if st.session_state.analysis_skipped:
+        st.warning("⚠️ This document doesn't look like a developer resume, so no AI analysis was run and no usage was counted. Please check that you uploaded the right file, or run the analysis anyway.")
+        if st.button("🔍 Analyze anyway"):
+            handle_analysis_click(resume_upload,resume_text,target_position,api_key,force=True)
+    jobs_running=poll_analysis_job()
     
     # Results section (only show if there are results)
     if st.session_state.analysis_result:
         st.markdown("---")
         st.markdown("### 📊 Evaluation Results")
         st.markdown(f"**Target Position:** {st.session_state.get('target_position','Not Selected')}")
+        if st.session_state.prescores:
+            render_prescores(st.session_state.prescores, st.session_state.get('target_position'), st.session_state.original_resume_content)
+        render_downgrade_notice(st.session_state.analysis_meta)
         
         # Analysis results in expandable container for better readability
         with st.expander("📋 Detailed Analysis Report", expanded=True):
@@ -543,42 +338,33 @@ def main():
 
         # Action buttons
         st.markdown("#### 📄 Download Analysis Report")
+        report_template=st.selectbox(
+            "Report template",
+            list(REPORT_TEMPLATES),
+            format_func=lambda name: REPORT_TEMPLATES[name]['label'],
+            key="report_template"
+        )
         col_a, col_b = st.columns(2)
         with col_a:
-                if st.button("📄 Download PDF Report",use_container_width=True):
-                    try:
-                        # Generate PDF report
-                        with st.spinner("Generating PDF report..."):
-                            pdf_buffer = generate_pdf_report(
-                                st.session_state.analysis_result, 
-                                st.session_state.get('target_position', 'Not Selected')
-                            )
-                        
-                        # Create download button
-                        current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        filename = f"Resume_Analysis_Report_{current_date}.pdf"
-                        
-                        st.download_button(
-                            label="📥 Click to Download PDF",
-                            data=pdf_buffer.getvalue(),
-                            file_name=filename,
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
-                        st.success("✅ PDF report generated successfully!")
-                    except Exception as e:
-                        st.error(f"❌ Error generating PDF: {str(e)}")
-                        # Show debug info in expander
-                        with st.expander("Debug Information"):
-                            st.text(f"Error details: {str(e)}")
-                            st.text("Analysis result preview:")
-                            st.text(st.session_state.analysis_result[:500] + "..." if len(st.session_state.analysis_result) > 500 else st.session_state.analysis_result)
+            analysis_result=st.session_state.analysis_result
+            report_position=st.session_state.get('target_position', 'Not Selected')
+            # Rendered on the first click only; later clicks and reruns are served from the artifact cache
+            st.download_button(
+                label="📄 Download PDF Report",
+                data=lambda: report_pdf_bytes(analysis_result, report_position, report_template),
+                file_name=f"Resume_Analysis_Report_{datetime.now().strftime('%Y%m%d')}.pdf",
+                mime="application/pdf",
+                on_click="ignore",
+                use_container_width=True,
+                key="analysis_report_pdf"
+            )
         
         with col_b:
             if st.button("🔄 Evaluate Again",use_container_width=True):
                 st.session_state.analysis_result=None
                 st.session_state.job_analysis=None
                 st.session_state.optimized_resume=None
+                st.session_state.optimize_job_id=None
                 st.rerun()
         
         # Job Optimization Section
@@ -604,16 +390,39 @@ def main():
             
             with col_job1:
                 st.markdown("#### Upload Job Posting File")
-                job_file = st.file_uploader("Upload Job Posting", type=["txt", "pdf", "docx"], 
-                                          help="Upload the job posting document", key="job_file")
+                job_file = st.file_uploader("Upload Job Posting", type=UPLOAD_TYPES, 
+                                          help="Upload the job posting document", key=f"job_file_{st.session_state.job_uploader_key}")
                 if job_file is not None:
-                    st.success(f"✅ Job posting uploaded: {job_file.name}")
+                    # Extracted once like the resume, so the poll reruns don't parse the file again
+                    load_job_upload(job_file)
+                    st.session_state.job_uploader_key += 1
+                    st.rerun()
+                job_upload = st.session_state.job_upload
+                if job_upload:
+                    if job_upload['error']:
+                        st.error(f"❌ {job_upload['error']}")
+                    else:
+                        st.success(f"✅ Job posting uploaded: {job_upload['name']}")
+                    if st.button("✖ Remove job posting"):
+                        st.session_state.job_upload = None
+                        st.rerun()
             
             with col_job2:
                 st.markdown("#### Or Paste Job Description")
                 job_description = st.text_area("Paste job description here", height=200, 
                                               placeholder="Paste the complete job posting including requirements, responsibilities, and qualifications...",
                                               key="job_desc")
+
+            if job_upload and job_upload['text']:
+                job_content = job_upload['text']
+            elif job_description:
+                job_content = job_description
+            else:
+                job_content = None
+            
+            # Speculatively analyze the job posting while the user is still reading their evaluation
+            if job_content and api_key:
+                start_job_analysis(job_content, api_key)
         else:
             # Show locked state for non-premium users
             st.text_input("🔒 Upload Job Posting File (Premium Only)", disabled=True, placeholder="Upgrade to premium to unlock this feature")
@@ -628,33 +437,20 @@ def main():
             optimize_button = False
             
         if optimize_button:
-            # Get job content (initialize variables for premium users)
-            if st.session_state.is_premium_user:
-                if 'job_file' in locals() and job_file:
-                    job_content = extract_file_content(job_file)
-                elif 'job_description' in locals() and job_description:
-                    job_content = job_description
-                else:
-                    st.error("Please upload a job posting file or paste the job description")
-                    job_content = None
+            if not job_content:
+                st.error("Please upload a job posting file or paste the job description")
             
             if job_content and st.session_state.original_resume_content:
-                with st.spinner("Analyzing job requirements..."):
-                    # Analyze job posting
-                    job_analysis = analyze_job_posting(job_content, api_key)
-                    st.session_state.job_analysis = job_analysis
-                
-                with st.spinner("Optimizing your resume for this job..."):
-                    # Rewrite resume based on job and evaluation
-                    optimized_resume = rewrite_resume_for_job(
-                        st.session_state.original_resume_content,
-                        job_analysis,
-                        st.session_state.analysis_result,
-                        api_key
-                    )
-                    st.session_state.optimized_resume = optimized_resume
-                
-                st.success("🎉 Resume optimized successfully!")
+                # Joins the speculative job analysis started above, then streams the rewrite in the background
+                job_id = get_job_queue().submit(
+                    "optimize", optimize_resume_for_job, job_content,
+                    st.session_state.original_resume_content,
+                    st.session_state.analysis_result,
+                    api_key
+                )
+                st.session_state.optimize_job_id = job_id
+        
+        jobs_running = poll_optimize_job() or jobs_running
         
         # Display optimization results
         if st.session_state.job_analysis and st.session_state.optimized_resume:
@@ -671,60 +467,57 @@ def main():
                 
                 # Download optimized resume in editable formats
                 st.info("💡 Download your optimized resume in editable format for further customization")
+                premium_templates = plan_features(current_plan())['premium_templates']
+                docx_template = st.selectbox(
+                    "Resume template",
+                    docx_template_names(premium_templates),
+                    format_func=lambda name: DOCX_TEMPLATES[name]['label'],
+                    key="docx_template"
+                )
+                if not premium_templates:
+                    locked = ", ".join(spec['label'] for spec in DOCX_TEMPLATES.values() if spec['premium'])
+                    st.caption(f"🔒 {locked} templates are available on Premium and Pro plans")
                 col_opt1, col_opt2, col_opt3 = st.columns(3)
                 
+                optimized_resume = st.session_state.optimized_resume
+                resume_date = datetime.now().strftime("%Y%m%d")
                 with col_opt1:
-                    if st.button("� Download DOCX", use_container_width=True, help="Editable Word document"):
-                        try:
-                            with st.spinner("Generating DOCX resume..."):
-                                docx_buffer = generate_resume_docx(st.session_state.optimized_resume)
-                            
-                            current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            filename = f"Optimized_Resume_{current_date}.docx"
-                            
-                            st.download_button(
-                                label="📥 Download DOCX",
-                                data=docx_buffer.getvalue(),
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                use_container_width=True,
-                                key="optimized_resume_docx"
-                            )
-                            st.success("✅ DOCX resume ready!")
-                        except Exception as e:
-                            st.error(f"❌ Error generating DOCX: {str(e)}")
+                    # Cheap enough to render up front; reruns are served from the artifact cache
+                    st.download_button(
+                        label="📄 Download DOCX",
+                        data=resume_docx_bytes(optimized_resume, docx_template),
+                        file_name=f"Optimized_Resume_{resume_date}.docx",
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        on_click="ignore",
+                        use_container_width=True,
+                        help="Editable Word document",
+                        key="optimized_resume_docx"
+                    )
                 
                 with col_opt2:
-                    if st.button("📝 Download TXT", use_container_width=True, help="Plain text format"):
-                        try:
-                            txt_buffer = generate_resume_txt(st.session_state.optimized_resume)
-                            
-                            current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            filename = f"Optimized_Resume_{current_date}.txt"
-                            
-                            st.download_button(
-                                label="📥 Download TXT",
-                                data=txt_buffer.getvalue(),
-                                file_name=filename,
-                                mime="text/plain",
-                                use_container_width=True,
-                                key="optimized_resume_txt"
-                            )
-                            st.success("✅ TXT resume ready!")
-                        except Exception as e:
-                            st.error(f"❌ Error generating TXT: {str(e)}")
+                    st.download_button(
+                        label="📝 Download TXT",
+                        data=lambda: resume_txt_bytes(optimized_resume),
+                        file_name=f"Optimized_Resume_{resume_date}.txt",
+                        mime="text/plain",
+                        on_click="ignore",
+                        use_container_width=True,
+                        help="Plain text format",
+                        key="optimized_resume_txt"
+                    )
                 
                 with col_opt3:
                     if st.button("🔄 Try Different Job", use_container_width=True):
                         st.session_state.job_analysis = None
                         st.session_state.optimized_resume = None
+                        st.session_state.optimize_job_id = None
                         st.rerun()
     else:
         # Show information when no evaluation has been completed yet
         st.info("""
         ### 🎯 AI Resume Analyzer Features:
         
-        **Step 1:** Upload your resume (TXT, PDF, or DOCX) or paste the text content
+        **Step 1:** Upload your resume (TXT, PDF, DOCX, RTF, ODT or HTML) or paste the text content
         
         **Step 2:** Select your target position and click "Evaluate Resume Now"
         
@@ -739,6 +532,11 @@ def main():
         - Job-specific resume optimization
         - Multiple download formats (PDF report, DOCX/TXT resume)
         """)
+    
+    # Auto-refresh while background jobs are running so progress and results show up without a click
+    if jobs_running:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
 
 if __name__=="__main__":
     main()
@@ -0,0 +1,370 @@
+"""
+Streamlit-free resume engine: extraction, analysis, optimization and export as plain functions
+
+The Streamlit app is a thin layer over this module; batch workers, CLIs and benchmarks import it
+without loading the Streamlit runtime.
+"""
+import hashlib
+import io
+import os
+from datetime import datetime
+from llm_cache import cached_completion, cached_stream, make_cache_key
+from llm_clients import get_openai_client
+from llm_resilience import call_llm, get_circuit_breaker
+from pipeline import SpeculativeStage
+from prompt_compaction import compact_prompt_input
+from analysis_schema import parse_score, parse_structured_analysis
+from extraction_cache import get_extraction_cache
+from extractors import UnsupportedFileTypeError, extract_text
+from text_normalization import PDF_SAFE, normalize_text
+from line_classifier import COMMENTARY_PHRASES, LineClassifier
+from artifact_cache import artifact_key, get_artifact_cache
+from report_templates import DEFAULT_REPORT_TEMPLATE, get_report_template
+from docx_templates import DEFAULT_DOCX_TEMPLATE, get_docx_template
+from upload_spool import spooled_upload
+
+API_BASE_URL="https://api.siliconflow.cn/v1"
+MODEL_NAME="Qwen/Qwen3-Next-80B-A3B-Instruct"
+# Cheaper model used for resumes the local pre-score marks as off-target
+FALLBACK_MODEL_NAME="Qwen/Qwen2.5-7B-Instruct"
+# Bump whenever a prompt below changes so cached responses are not reused across prompt versions
+PROMPT_VERSION="1"
+# Bump whenever text extraction changes so cached extracted text is not reused
+EXTRACTOR_VERSION="6"
+# Bump whenever a report/resume generator's output changes so cached downloads are re-rendered
+REPORT_TEMPLATE_VERSION="4"
+RESUME_TEMPLATE_VERSION="3"
+ANALYSIS_MAX_TOKENS=1500
+STRUCTURED_ANALYSIS_MAX_TOKENS=1200
+SCORE_ONLY_MAX_TOKENS=16
+# Per-input token budgets applied before text is inlined into a prompt
+RESUME_TOKEN_BUDGET=6000
+JOB_POSTING_TOKEN_BUDGET=4000
+JOB_ANALYSIS_TOKEN_BUDGET=2000
+FEEDBACK_TOKEN_BUDGET=2000
+ANALYSIS_SYSTEM_PROMPT="you act as an assistant like a senior professional to evaluate the candidate's resume with insightful analysis and advice"
+UPLOAD_TYPES=["txt","pdf","docx","rtf","odt","html","htm"]
+SUPPORTED_FORMATS_LABEL="TXT, PDF, DOCX, RTF, ODT or HTML"
+TARGET_POSITION=["FrontEnd Developer","BackEnd Developer","FullStack Developer","Data Analytics Developer"]
+# Line classifiers for the resume exporters; the TXT export also drops notes and explanations
+DOCX_LINE_CLASSIFIER=LineClassifier()
+TXT_LINE_CLASSIFIER=LineClassifier(COMMENTARY_PHRASES+('commentary:','note:','explanation:'),section_keywords=())
+# File extension -> MIME type for documents read from disk
+MIME_TYPES={
+    '.txt': "text/plain",
+    '.pdf': "application/pdf",
+    '.docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    '.rtf': "application/rtf",
+    '.odt': "application/vnd.oasis.opendocument.text",
+    '.html': "text/html",
+    '.htm': "text/html",
+}
+# Features per subscription plan
+PLAN_FEATURES={
+    'free': {
+        'max_analyses': 3,
+        'job_optimization': False,
+        'premium_templates': False,
+        'priority_support': False,
+        'cover_letter': False
+    },
+    'premium': {
+        'max_analyses': float('inf'),
+        'job_optimization': True,
+        'premium_templates': True,
+        'priority_support': False,
+        'cover_letter': False
+    },
+    'pro': {
+        'max_analyses': float('inf'),
+        'job_optimization': True,
+        'premium_templates': True,
+        'priority_support': True,
+        'cover_letter': True
+    }
+}
+
+def plan_features(subscription):
+    """Features available on a subscription plan, falling back to the free plan"""
+    return PLAN_FEATURES.get(subscription, PLAN_FEATURES['free'])
+
+def clean_text_for_pdf(text):
+    """Clean text content to make it safe for PDF generation"""
+    return normalize_text(text, PDF_SAFE)
+
+def read_file_text(uploaded_file, release=None):
+    """Extract text from an uploaded document, reusing cached text for identical file bytes"""
+    file_type = uploaded_file.type
+    # Large uploads are parsed from a memory-mapped temp file; release drops the in-memory copy once it is spilled
+    with spooled_upload(uploaded_file, release) as data:
+        # Dispatch sniffs the magic bytes; the browser-supplied type is only a fallback
+        return get_extraction_cache().get_or_extract(
+            data, file_type, EXTRACTOR_VERSION, lambda: extract_text(data, file_type)
+        )
+
+def extract_file_content(uploaded_file):
+    if uploaded_file is None: 
+        return None 
+    
+    try:
+        return read_file_text(uploaded_file)
+    except UnsupportedFileTypeError:
+        return f"Unsupported file type: {uploaded_file.type}. Please upload a {SUPPORTED_FORMATS_LABEL} file."
+    except Exception as e:
+        return f"Error reading file: {str(e)}. Please ensure the file is not corrupted and try again."
+
+
+class LocalUpload(io.BytesIO):
+    """In-memory file that mimics the Streamlit UploadedFile attributes used by the extractors"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+        self.type = MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+def read_path_text(path):
+    """Extract text from a document on disk, reusing cached text for identical file bytes"""
+    return read_file_text(LocalUpload(path))
+
+def client_breaker(client):
+    """The circuit breaker for the API key and endpoint a client calls"""
+    return get_circuit_breaker(client.api_key, str(client.base_url))
+
+def complete_chat(client, messages, max_tokens, model=MODEL_NAME):
+    """Run a blocking chat completion and return the full response text"""
+    response = call_llm(lambda timeout: client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,
+        timeout=timeout
+    ), latency_key=(model, max_tokens), breaker=client_breaker(client))
+    return response.choices[0].message.content
+
+def stream_chat(client, messages, max_tokens, model=MODEL_NAME):
+    """Run a streaming chat completion and yield text deltas as they arrive"""
+    # Retries only cover opening the stream; hedging is skipped since both streams would be billed in full
+    response = call_llm(lambda timeout: client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,
+        stream=True,
+        timeout=timeout
+    ), latency_key=(model, max_tokens, 'stream'), hedge=False, breaker=client_breaker(client))
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def run_chat(kind, inputs, client, messages, max_tokens, stream=False, model=MODEL_NAME):
+    """Run a cached chat completion, returning the text or a generator of text chunks when stream is set"""
+    if stream:
+        return cached_stream(kind, model, PROMPT_VERSION, inputs,
+                             lambda: stream_chat(client, messages, max_tokens, model))
+    return cached_completion(kind, model, PROMPT_VERSION, inputs,
+                             lambda: complete_chat(client, messages, max_tokens, model))
+
+def missing_api_key_response(stream=False):
+    message = "Enter your API key"
+    return iter([message]) if stream else message
+
+def build_analysis_messages(resume_text,target_postion):
+    """Build the chat messages for a resume evaluation"""
+    prompt = f"you are senior HR analyst assistant, taking account of the resume submitted by the candidate, you need to analyze the resume to validate if the candidate qualifies for the requirements listed in {target_postion}: \n based on{resume_text}please provide:1,overall assessment score (1-100);2,detailed analysis with suggestion for improvements; 3,list the candidate major outstandings, together with personalised advice on his/her future professional path"
+
+    return [
+        {"role":"system","content":ANALYSIS_SYSTEM_PROMPT}
+       ,{"role":"user","content":prompt}
+    ]
+
+def analyze_resume_with_ai(resume_text,target_postion,api_key,stream=False,model=MODEL_NAME):
+    if not api_key or not api_key.strip():
+        return missing_api_key_response(stream)
+
+    client = get_openai_client(api_key,API_BASE_URL)
+    resume_text = compact_prompt_input(resume_text, RESUME_TOKEN_BUDGET)
+    messages = build_analysis_messages(resume_text,target_postion)
+    return run_chat("analysis", (resume_text, target_postion), client, messages, ANALYSIS_MAX_TOKENS, stream, model)
+
+def build_structured_analysis_messages(resume_text,target_postion):
+    """Build the chat messages for a resume evaluation that replies with a JSON object"""
+    prompt = f"""you are senior HR analyst assistant. Analyze the resume below to validate if the candidate qualifies for the requirements of a {target_postion} position.
+
+    Resume:
+    {resume_text}
+
+    Respond with ONLY a JSON object, no markdown fences or commentary, using exactly these keys:
+    "score": integer overall assessment score from 1 to 100,
+    "strengths": list of short strings describing the candidate's major outstandings,
+    "gaps": list of short strings describing missing or weak qualifications,
+    "recommendations": list of short, actionable suggestions for improvement,
+    "career_path": string with personalised advice on the candidate's future professional path"""
+
+    return [
+        {"role":"system","content":ANALYSIS_SYSTEM_PROMPT},
+        {"role":"user","content":prompt}
+    ]
+
+def build_score_messages(resume_text,target_postion):
+    """Build the chat messages for a score-only evaluation"""
+    prompt = f"""Rate how well the resume below qualifies the candidate for a {target_postion} position.
+
+    Resume:
+    {resume_text}
+
+    Respond with ONLY a JSON object of the form {{"score": <integer from 1 to 100>}}."""
+
+    return [
+        {"role":"system","content":ANALYSIS_SYSTEM_PROMPT},
+        {"role":"user","content":prompt}
+    ]
+
+def analyze_resume_structured(resume_text,target_postion,api_key):
+    """Evaluate a resume and return a validated ResumeAnalysis"""
+    if not api_key or not api_key.strip():
+        raise ValueError("Enter your API key")
+
+    client = get_openai_client(api_key,API_BASE_URL)
+    resume_text = compact_prompt_input(resume_text, RESUME_TOKEN_BUDGET)
+    messages = build_structured_analysis_messages(resume_text,target_postion)
+    reply = run_chat("analysis_structured", (resume_text, target_postion), client, messages, STRUCTURED_ANALYSIS_MAX_TOKENS)
+    return parse_structured_analysis(reply)
+
+def score_resume(resume_text,target_postion,api_key):
+    """Return only the 1-100 match score for a resume, using a tiny completion budget"""
+    if not api_key or not api_key.strip():
+        raise ValueError("Enter your API key")
+
+    client = get_openai_client(api_key,API_BASE_URL)
+    resume_text = compact_prompt_input(resume_text, RESUME_TOKEN_BUDGET)
+    messages = build_score_messages(resume_text,target_postion)
+    reply = run_chat("score", (resume_text, target_postion), client, messages, SCORE_ONLY_MAX_TOKENS)
+    return parse_score(reply)
+
+def analyze_job_posting(job_description, api_key, stream=False):
+    """Analyze job posting to extract key requirements and skills"""
+    if not api_key or not api_key.strip():
+        return missing_api_key_response(stream)
+
+    client = get_openai_client(api_key, API_BASE_URL)
+    job_description = compact_prompt_input(job_description, JOB_POSTING_TOKEN_BUDGET)
+    prompt = f"""You are a senior HR analyst. Analyze the following job posting and extract:
+    1. Key required skills and technologies
+    2. Preferred qualifications
+    3. Soft skills and personality traits
+    4. Experience level requirements
+    5. Main responsibilities and duties
+    6. Keywords that should appear in a tailored resume
+    
+    Job Posting:
+    {job_description}
+    
+    Please provide a structured analysis that can be used to optimize a resume for this position."""
+
+    messages=[
+        {"role": "system", "content": "you act as an expert HR analyst who understands job requirements and can extract key information for resume optimization"},
+        {"role": "user", "content": prompt}
+    ]
+    return run_chat("job_analysis", (job_description,), client, messages, 1500, stream)
+
+job_analysis_stage = SpeculativeStage("job_analysis", analyze_job_posting)
+
+def start_job_analysis(job_description, api_key):
+    """Start (or join) the background job-posting analysis keyed by the posting's content hash and the API key"""
+    # Only runs with the same key are joined, so one user's invalid or rate-limited key never fails another's
+    # optimization; finished analyses are still shared across keys through the response cache
+    key = (make_cache_key("job_analysis", MODEL_NAME, PROMPT_VERSION, job_description),
+           hashlib.sha256(api_key.encode('utf-8')).hexdigest())
+    return job_analysis_stage.submit(key, job_description, api_key)
+
+def rewrite_resume_for_job(original_resume, job_analysis, evaluation_feedback, api_key, stream=False):
+    """Rewrite resume to better match job requirements based on evaluation feedback"""
+    if not api_key or not api_key.strip():
+        return missing_api_key_response(stream)
+
+    client = get_openai_client(api_key, API_BASE_URL)
+    original_resume = compact_prompt_input(original_resume, RESUME_TOKEN_BUDGET)
+    job_analysis = compact_prompt_input(job_analysis, JOB_ANALYSIS_TOKEN_BUDGET)
+    evaluation_feedback = compact_prompt_input(evaluation_feedback, FEEDBACK_TOKEN_BUDGET)
+    prompt = f"""You are a professional resume writer with expertise in ATS optimization and job matching.
+    
+    Based on the following information, rewrite the candidate's resume to better match the job requirements:
+    
+    ORIGINAL RESUME:
+    {original_resume}
+    
+    JOB REQUIREMENTS ANALYSIS:
+    {job_analysis}
+    
+    EVALUATION FEEDBACK:
+    {evaluation_feedback}
+    
+    IMPORTANT: Provide ONLY the complete, polished resume content in standard resume format. Do NOT include:
+    - Explanatory text or commentary
+    - Analysis or evaluation remarks
+    - Suggestions or recommendations
+    - Meta-commentary about the changes made
+    
+    The output should be a clean, professional resume with:
+    1. Contact information section
+    2. Professional summary/objective
+    3. Work experience with bullet points
+    4. Education section
+    5. Skills section
+    6. Any relevant additional sections (certifications, projects, etc.)
+    
+    Optimize the resume by:
+    - Using keywords from job requirements
+    - Highlighting relevant experience and skills
+    - Improving ATS compatibility
+    - Quantifying achievements where possible
+    - Tailoring content to the specific role
+    
+    Output the resume content ready for immediate use and submission."""
+
+    messages=[
+        {"role": "system", "content": "You are an expert resume writer who creates ATS-optimized, compelling resumes that match job requirements perfectly"},
+        {"role": "user", "content": prompt}
+    ]
+    return run_chat("rewrite", (original_resume, job_analysis, evaluation_feedback), client, messages, 2500, stream)
+
+def optimize_resume_for_job(job_content, original_resume, evaluation_feedback, api_key):
+    """Analyze the job posting, then stream the rewritten resume; returns both texts when the generator finishes"""
+    job_analysis = start_job_analysis(job_content, api_key).result()
+    chunks = []
+    for chunk in rewrite_resume_for_job(original_resume, job_analysis, evaluation_feedback, api_key, stream=True):
+        chunks.append(chunk)
+        yield chunk
+    return {'job_analysis': job_analysis, 'optimized_resume': ''.join(chunks)}
+
+def generate_pdf_report(analysis_result, target_position, candidate_name="Candidate", template=DEFAULT_REPORT_TEMPLATE, report_date=None):
+    """Generate a PDF report from the analysis results"""
+    return get_report_template(template).render(analysis_result, target_position, candidate_name, report_date)
+
+def generate_resume_docx(resume_content, filename="Resume", template=DEFAULT_DOCX_TEMPLATE):
+    """Generate a clean DOCX file from resume content"""
+    # Leave out any remaining analysis commentary; headers, bullets and body text each get their template style
+    return get_docx_template(template).render(DOCX_LINE_CLASSIFIER.content_lines(resume_content))
+
+def generate_resume_txt(resume_content):
+    """Generate a clean TXT file from resume content"""
+    # Clean the content - remove any analysis commentary; the text itself (emails in <>, *args) is kept as written
+    clean_content = '\n'.join(line for _, line in TXT_LINE_CLASSIFIER.content_lines(resume_content))
+    return io.BytesIO(clean_content.encode('utf-8'))
+
+def render_artifact(fmt, content, template_version, render, *params):
+    """Render a download once per (content, format, template version, params) and return its bytes"""
+    key = artifact_key(content, fmt, template_version, *params)
+    return get_artifact_cache().get_or_render(key, render)
+
+def report_pdf_bytes(analysis_result, target_position, template=DEFAULT_REPORT_TEMPLATE):
+    # The report prints its generation date, so a new day means a new artifact
+    report_date = datetime.now().strftime("%B %d, %Y")
+    render = lambda: generate_pdf_report(analysis_result, target_position, template=template, report_date=report_date)
+    return render_artifact("pdf", analysis_result, REPORT_TEMPLATE_VERSION, render, template, target_position, report_date)
+
+def resume_docx_bytes(resume_content, template=DEFAULT_DOCX_TEMPLATE):
+    render = lambda: generate_resume_docx(resume_content, template=template)
+    return render_artifact("docx", resume_content, RESUME_TEMPLATE_VERSION, render, template)
+
+def resume_txt_bytes(resume_content):
+    return render_artifact("txt", resume_content, RESUME_TEMPLATE_VERSION, lambda: generate_resume_txt(resume_content))
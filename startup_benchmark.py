@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Cold-start profiler and budget check for the Streamlit entry points
+
+Each entry point is loaded in a fresh interpreter under ``python -X importtime``. The script prints the
+slowest imports and where the time goes per top-level package. It exits non-zero if an entry point is over
+its time budget, or if any heavy optional SDK is imported at startup. Those SDKs should load on first use.
+
+Usage:
+    python startup_benchmark.py                           # all entry points, default budget
+    python startup_benchmark.py --entry resume_analyzer.py --top 30
+    python startup_benchmark.py --budget-ms 800 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# The main app is imported like a module; the multipage scripts are executed, as Streamlit runs them
+ENTRY_POINTS = ("resume_analyzer.py", "Home.py", "pages/2_💳_Pricing.py")
+SECRETS_TEMPLATE = os.path.join(ROOT, "secrets_template.toml")
+STARTUP_BUDGET_MS = float(os.getenv("RESUME_ANALYZER_STARTUP_BUDGET_MS", "1000"))
+# Only features that need these may load them; none of them may be imported while a page starts up
+FORBIDDEN_AT_STARTUP = ("openai", "httpx", "reportlab", "PyPDF2", "docx", "numpy", "pandas", "stripe")
+
+_CHILD = """
+import json, runpy, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+if {as_module!r}:
+    __import__({module!r})
+else:
+    # Pages read st.secrets while rendering; the template's placeholder values stand in for real ones
+    from streamlit import config
+    config.set_option("secrets.files", [{secrets!r}])
+    runpy.run_path({path!r}, run_name="__main__")
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "modules": sorted(sys.modules)}}))
+"""
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into (module, self us, cumulative us) tuples"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+def profile_entry(entry):
+    """Load one entry point in a fresh interpreter; returns (seconds, loaded module names, imports)"""
+    path = os.path.join(ROOT, entry)
+    as_module = entry == "resume_analyzer.py"
+    code = _CHILD.format(root=ROOT, as_module=as_module, module=os.path.splitext(entry)[0], path=path,
+                         secrets=SECRETS_TEMPLATE)
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, encoding="utf-8")
+    if result.returncode != 0:
+        raise RuntimeError(f"{entry} failed to start:\n{result.stderr[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report["seconds"], report["modules"], parse_importtime(result.stderr)
+
+def package_totals(imports):
+    """Self time per top-level package, in microseconds, largest first"""
+    totals = defaultdict(int)
+    for name, self_us, _ in imports:
+        totals[name.split(".")[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile Streamlit entry point cold starts and enforce a time budget")
+    parser.add_argument("--entry", action="append", choices=ENTRY_POINTS,
+                        help="Entry point to profile (repeatable; default: all)")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Allowed median startup time per entry point (default: RESUME_ANALYZER_STARTUP_BUDGET_MS or 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per entry point; the median is compared")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports and packages to list")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    failures = []
+    results = {}
+    for entry in args.entry or ENTRY_POINTS:
+        runs = [profile_entry(entry) for _ in range(max(1, args.repeat))]
+        startup_ms = statistics.median(seconds for seconds, _, _ in runs) * 1000
+        # Import timings come from the run closest to the median
+        _, modules, imports = min(runs, key=lambda run: abs(run[0] * 1000 - startup_ms))
+        forbidden = sorted(name for name in FORBIDDEN_AT_STARTUP if name in modules)
+
+        print(f"\n{entry}: {startup_ms:.0f} ms (budget {args.budget_ms:.0f} ms), {len(imports)} modules imported")
+        print(f"  {'slowest imports':<52} {'self ms':>9} {'cumul ms':>9}")
+        for name, self_us, cumulative_us in sorted(imports, key=lambda item: item[2], reverse=True)[:args.top]:
+            print(f"  {name:<52} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+        print(f"  {'by package':<52} {'self ms':>9}")
+        packages = package_totals(imports)
+        for package, self_us in packages[:args.top]:
+            print(f"  {package:<52} {self_us / 1000:>9.1f}")
+
+        if startup_ms > args.budget_ms:
+            failures.append(f"{entry}: {startup_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        if forbidden:
+            failures.append(f"{entry}: imports {', '.join(forbidden)} at startup")
+        results[entry] = {
+            'startup_ms': round(startup_ms, 1),
+            'forbidden_imports': forbidden,
+            'packages_ms': {package: round(self_us / 1000, 2) for package, self_us in packages},
+        }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nAll entry points are within the startup budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
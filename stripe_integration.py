@@ -2,30 +2,50 @@
 Stripe Payment Integration for AI Resume Analyzer
 """
 import streamlit as st
-import stripe
 import os
 from datetime import datetime, timedelta
 
-# Configure Stripe with your live credentials
-try:
-    stripe.api_key = st.secrets.get("STRIPE_SECRET_KEY")
-    if not stripe.api_key:
-        # Fallback for local development
-        stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "sk_test_...")
-        st.warning("⚠️ Using test Stripe key. Add STRIPE_SECRET_KEY to Streamlit secrets for production.")
-except:
-    st.error("❌ Stripe configuration error. Please check your API keys.")
+# The Stripe SDK and secrets are loaded on first use, not when the pricing page is imported
+_stripe = None
+_price_ids = None
 
-# Stripe Price IDs - You'll create these in your Stripe dashboard
-PRICE_IDS = {
-    'premium_monthly': st.secrets.get("STRIPE_PREMIUM_PRICE_ID", "price_premium_monthly"),
-    'pro_monthly': st.secrets.get("STRIPE_PRO_PRICE_ID", "price_pro_monthly"),
-    'single_analysis': st.secrets.get("STRIPE_SINGLE_PRICE_ID", "price_single_analysis")
-}
+def get_stripe():
+    """Import the Stripe SDK and configure it with your live credentials on first use"""
+    global _stripe
+    if _stripe is None:
+        import stripe
+        try:
+            stripe.api_key = st.secrets.get("STRIPE_SECRET_KEY")
+            if not stripe.api_key:
+                # Fallback for local development
+                stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "sk_test_...")
+                st.warning("⚠️ Using test Stripe key. Add STRIPE_SECRET_KEY to Streamlit secrets for production.")
+        except:
+            st.error("❌ Stripe configuration error. Please check your API keys.")
+        _stripe = stripe
+    return _stripe
+
+def get_price_ids():
+    """Stripe Price IDs - You'll create these in your Stripe dashboard"""
+    global _price_ids
+    if _price_ids is None:
+        _price_ids = {
+            'premium_monthly': st.secrets.get("STRIPE_PREMIUM_PRICE_ID", "price_premium_monthly"),
+            'pro_monthly': st.secrets.get("STRIPE_PRO_PRICE_ID", "price_pro_monthly"),
+            'single_analysis': st.secrets.get("STRIPE_SINGLE_PRICE_ID", "price_single_analysis")
+        }
+    return _price_ids
+
+def __getattr__(name):
+    # PRICE_IDS is still importable, but only read from secrets when someone asks for it
+    if name == 'PRICE_IDS':
+        return get_price_ids()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_checkout_session(price_id, success_url, cancel_url, customer_email=None):
     """Create a Stripe checkout session"""
     try:
+        stripe = get_stripe()
         checkout_session = stripe.checkout.Session.create(
             payment_method_types=['card'],
             line_items=[{
@@ -49,6 +69,7 @@ def create_checkout_session(price_id, success_url, cancel_url, customer_email=No
 def create_customer_portal_session(customer_id, return_url):
     """Create a Stripe customer portal session for subscription management"""
     try:
+        stripe = get_stripe()
         portal_session = stripe.billing_portal.Session.create(
             customer=customer_id,
             return_url=return_url,
@@ -61,6 +82,7 @@ def create_customer_portal_session(customer_id, return_url):
 def handle_webhook(payload, sig_header):
     """Handle Stripe webhooks for subscription updates"""
     endpoint_secret = st.secrets.get("STRIPE_WEBHOOK_SECRET")
+    stripe = get_stripe()
     
     try:
         event = stripe.Webhook.construct_event(
@@ -156,7 +178,7 @@ def enhanced_pricing_page():
         st.markdown("✅ Premium support")
         
         # Use real Stripe integration
-        show_payment_button("Premium", "9.99", PRICE_IDS['premium_monthly'])
+        show_payment_button("Premium", "9.99", get_price_ids()['premium_monthly'])
     
     with col3:  # Pro plan
         st.markdown("### 🌟 Pro Plan")
@@ -165,7 +187,7 @@ def enhanced_pricing_page():
         st.markdown("✅ Cover letter generation")
         st.markdown("✅ Priority support")
         
-        show_payment_button("Pro", "19.99", PRICE_IDS['pro_monthly'])
+        show_payment_button("Pro", "19.99", get_price_ids()['pro_monthly'])
 
 # Security considerations:
 def validate_user_session():
@@ -0,0 +1,150 @@
+"""
+Precompiled text normalization shared by PDF reports, prompts and plain-text exports
+"""
+import codecs
+import re
+
+# Emoji the analysis prompt tends to produce; report fonts have no glyphs for them, so they are spelled out
+EMOJI_LABELS = {
+    '✅': '[YES] ',
+    '❌': '[NO] ',
+    '🔍': '[FOCUS] ',
+    '💡': '[TIP] ',
+    '🌟': '[STAR] ',
+    '🚀': '[GROWTH] ',
+}
+ASCII_LABELS = {'•': '* ', **EMOJI_LABELS}
+
+# Characters that only get in the way: zero-width marks, BOM and soft hyphen go, odd spaces become plain ones
+_INVISIBLE = {'\u200b': '', '\u200c': '', '\u200d': '', '\u2060': '', '\ufeff': '', '\u00ad': ''}
+_SPACES = {'\u00a0': ' ', '\u2007': ' ', '\u202f': ' '}
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# rule -> (pattern, character that must appear in the text for the rule to ever match)
+# Line rules are matched from the preceding newline rather than ^, so the regex engine can jump between candidates
+_LINE_PATTERNS = {
+    # Markdown table lines: separators are dropped, rows flattened to "cell - cell"
+    'table': (r'[^\S\n]*\|[^\n]*', '|'),
+    'heading': (r'#{1,6}[ \t]*', '#'),
+    'dash_bullet': (r'-[ \t]*', '-'),
+}
+# Each inline pattern has exactly one group, the content that is kept
+_INLINE_PATTERNS = {
+    'bold': (r'\*\*([^*\n]+)\*\*', '*'),
+    'italic': (r'\*([^*\n]+)\*', '*'),
+    'code': (r'`([^`\n]+)`', '`'),
+}
+_TABLE_SEPARATOR_RE = re.compile(r'\s*\|[-\s|]+\|\s*')
+_HTML_RE = re.compile(r'<[^>]+>')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_SPACE_RUN_RE = re.compile(r'  +')
+
+class NormalizationRules:
+    """A named normalization profile; patterns and character mappings are compiled once, up front"""
+
+    def __init__(self, name, strip_html=False, markup=(), replacements=None, ascii_only=False, drop_control=True,
+                 collapse_blank_lines=True, collapse_spaces=True, bullet='• '):
+        self.name = name
+        self.strip_html = strip_html
+        self.markup = tuple(markup)
+        self.ascii_only = ascii_only
+        self.drop_control = drop_control
+        self.collapse_blank_lines = collapse_blank_lines
+        self.collapse_spaces = collapse_spaces
+        self.bullet = bullet
+
+        # Line rules share one alternation behind a common newline, inline rules another, so each is a single scan.
+        # Inline alternatives are left unnamed: named groups stop sre from skipping ahead to candidate characters
+        line_rules = [rule for rule in self.markup if rule in _LINE_PATTERNS]
+        inline_rules = [rule for rule in self.markup if rule in _INLINE_PATTERNS]
+        self._line_re = re.compile(
+            r'\n(?:' + '|'.join(f'(?P<{rule}>{_LINE_PATTERNS[rule][0]})' for rule in line_rules) + ')'
+        ) if line_rules else None
+        self._inline_re = re.compile(
+            '|'.join(_INLINE_PATTERNS[rule][0] for rule in inline_rules)
+        ) if inline_rules else None
+        self._line_triggers = {_LINE_PATTERNS[rule][1] for rule in line_rules}
+        self._inline_triggers = {_INLINE_PATTERNS[rule][1] for rule in inline_rules}
+
+        self._mapping = dict(_INVISIBLE)
+        self._mapping.update(_SPACES)
+        self._mapping.update(replacements or {})
+        self._mapped_chars = frozenset(self._mapping)
+        if ascii_only:
+            # Label replacement and ASCII folding both happen inside one str.encode call
+            self._codec_errors = f"text-normalization-{name}"
+            codecs.register_error(self._codec_errors, self._encode_error)
+        else:
+            self._chars_re = re.compile('[' + ''.join(map(re.escape, self._mapping)) + ']')
+
+    def _encode_error(self, error):
+        # Called once per run of consecutive non-ASCII characters
+        chars = error.object[error.start:error.end]
+        if self._mapped_chars.isdisjoint(chars):
+            return ' ', error.end
+        return ''.join(self._mapping.get(char, ' ') for char in chars), error.end
+
+    def _replace_line(self, match):
+        rule = match.lastgroup
+        if rule == 'table':
+            line = match.group(rule)
+            if _TABLE_SEPARATOR_RE.fullmatch(line):
+                return ''
+            cells = [cell.strip() for cell in line.strip().split('|')[1:-1]]
+            # Returning '' also removes the line's newline, i.e. the whole line
+            return '\n' + ' - '.join(filter(None, cells)) if cells else ''
+        if rule == 'heading':
+            return '\n'
+        # dash_bullet
+        return '\n' + self.bullet
+
+    @staticmethod
+    def _replace_inline(match):
+        return match.group(match.lastindex)
+
+    def apply(self, text):
+        if not text:
+            return ""
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if self.strip_html and '<' in text:
+            text = _HTML_RE.sub('', text)
+        if self._line_re is not None and any(trigger in text for trigger in self._line_triggers):
+            # The leading newline lets line rules match the first line; every result keeps it unless empty
+            text = self._line_re.sub(self._replace_line, '\n' + text)[1:]
+        if self._inline_re is not None and any(trigger in text for trigger in self._inline_triggers):
+            text = self._inline_re.sub(self._replace_inline, text)
+        if self.ascii_only:
+            if not text.isascii():
+                text = text.encode('ascii', self._codec_errors).decode('ascii')
+        elif not self._mapped_chars.isdisjoint(text):
+            text = self._chars_re.sub(lambda match: self._mapping[match.group()], text)
+        if self.drop_control:
+            text = _CONTROL_RE.sub('', text)
+        if self.collapse_blank_lines:
+            text = _BLANK_LINES_RE.sub('\n\n', text)
+        if self.collapse_spaces:
+            text = _SPACE_RUN_RE.sub(' ', text)
+        return text.strip()
+
+# Report PDFs: drawn with a registered Unicode TTF, so only markup and emoji need to go
+PDF_SAFE = NormalizationRules('pdf-safe', strip_html=True, markup=('table',), replacements=EMOJI_LABELS, drop_control=False)
+# Output limited to ASCII, e.g. PDFs drawn with reportlab's built-in base fonts
+PDF_ASCII = NormalizationRules(
+    'pdf-ascii', strip_html=True, markup=('table',), replacements=ASCII_LABELS, ascii_only=True, drop_control=False
+)
+# Text inlined into LLM prompts: keep everything meaningful, drop invisible and control characters
+PROMPT_SAFE = NormalizationRules('prompt-safe', collapse_blank_lines=False)
+# Plain-text exports: markdown formatting stripped, Unicode kept
+PLAIN_TEXT = NormalizationRules(
+    'plain-text', strip_html=True,
+    markup=('table', 'bold', 'italic', 'code', 'heading', 'dash_bullet')
+)
+
+RULE_SETS = {rules.name: rules for rules in (PDF_SAFE, PDF_ASCII, PROMPT_SAFE, PLAIN_TEXT)}
+
+def normalize_text(text, rules=PDF_SAFE):
+    """Normalize text with a rule set (a NormalizationRules or the name of one in RULE_SETS)"""
+    if isinstance(rules, str):
+        rules = RULE_SETS[rules]
+    return rules.apply(text)
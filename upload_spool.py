@@ -0,0 +1,64 @@
+"""
+Spill large uploads to disk and hand extractors a memory-mapped view instead of an in-memory copy
+"""
+import contextlib
+import mmap
+import os
+import shutil
+import tempfile
+
+# Uploads larger than this are copied to a temp file and parsed through mmap
+UPLOAD_SPILL_BYTES = int(os.getenv("RESUME_ANALYZER_UPLOAD_SPILL_BYTES", str(2 * 1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("RESUME_ANALYZER_UPLOAD_SPOOL_DIR") or None
+COPY_CHUNK_BYTES = 1024 * 1024
+
+def upload_size(uploaded_file):
+    size = getattr(uploaded_file, 'size', None)
+    if size is None:
+        position = uploaded_file.tell()
+        size = uploaded_file.seek(0, os.SEEK_END)
+        uploaded_file.seek(position)
+    return size
+
+class MappedFile(mmap.mmap):
+    """Read-only mmap that also passes for a seekable binary file (zipfile checks seekable(), added to mmap only in 3.13)"""
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+@contextlib.contextmanager
+def map_file(path):
+    """Memory-map a file read-only"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files
+            yield b''
+            return
+        with MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+@contextlib.contextmanager
+def spooled_upload(uploaded_file, release=None):
+    """Yield an upload's bytes, spilling uploads over UPLOAD_SPILL_BYTES to a memory-mapped temp file
+
+    release(uploaded_file), if given, is called as soon as the bytes are on disk so the caller can drop
+    its in-memory copy before parsing starts.
+    """
+    if upload_size(uploaded_file) <= UPLOAD_SPILL_BYTES:
+        yield uploaded_file.getvalue()
+        return
+
+    fd, path = tempfile.mkstemp(prefix="upload-", dir=UPLOAD_SPOOL_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            uploaded_file.seek(0)
+            shutil.copyfileobj(uploaded_file, spool, COPY_CHUNK_BYTES)
+        if release:
+            release(uploaded_file)
+        with map_file(path) as mapped:
+            yield mapped
+    finally:
+        os.unlink(path)